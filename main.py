@@ -46,21 +46,39 @@ def parse_args() -> argparse.Namespace:
         default="on",
         help="Enable or disable LLM usage for ambiguous slots.",
     )
+    parser.add_argument(
+        "--llm-backend",
+        choices=["hf", "vllm"],
+        default="hf",
+        help="Inference backend: transformers (hf) or vLLM (requires the optional vllm package and a GPU).",
+    )
+    parser.add_argument(
+        "--compile-model",
+        action="store_true",
+        help="Compile the hf model with torch.compile and a static KV cache (CUDA only; ignored on CPU).",
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=["int8", "int4"],
+        default=None,
+        help="Load the hf model with bitsandbytes INT8 or INT4 weights (requires a GPU).",
+    )
     return parser.parse_args()
 
 
 def _load_env_file(env_path: Path) -> None:
     if not env_path.exists():
         return
-    for raw_line in env_path.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        key = key.strip()
-        value = value.strip().strip('"').strip("'")
-        if key and key not in os.environ:
-            os.environ[key] = value
+    with env_path.open("r", encoding="utf-8") as f:
+        for raw_line in f:
+            line = raw_line.strip()
+            if not line or line[0] == "#" or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+            if key and key not in os.environ:
+                os.environ[key] = value
 
 
 def main() -> None:
@@ -91,6 +109,9 @@ def main() -> None:
         strict=args.strict,
         seed=args.seed,
         llm_enabled=args.llm == "on",
+        llm_backend=args.llm_backend,
+        compile_model=args.compile_model,
+        quantization=args.quantization,
     )
 
     if args.report:
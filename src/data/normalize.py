@@ -1,12 +1,20 @@
+import functools
 import json
 import unicodedata
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
 
+def strip_accents(text: str) -> str:
+    # ASCII text has nothing for NFKD to decompose.
+    if text.isascii():
+        return text
+    return "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+
+
+@functools.lru_cache(maxsize=4096)
 def normalize_key(value: str) -> str:
-    text = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
-    return " ".join(text.lower().split())
+    return " ".join(strip_accents(value).lower().split())
 
 
 def load_json(path: Path) -> Dict[str, Any]:
@@ -26,12 +34,16 @@ def _try_parse_json(value: Any) -> Any:
 
 
 def _normalize_value(value: Any) -> Any:
-    if isinstance(value, str):
+    # json.load only produces exact builtin types, so identity checks suffice.
+    value_type = type(value)
+    if value_type is str:
         trimmed = value.strip()
+        if unicodedata.is_normalized("NFC", trimmed):
+            return trimmed
         return unicodedata.normalize("NFC", trimmed)
-    if isinstance(value, list):
+    if value_type is list:
         return [_normalize_value(v) for v in value]
-    if isinstance(value, dict):
+    if value_type is dict:
         return {k: _normalize_value(v) for k, v in value.items()}
     return value
 
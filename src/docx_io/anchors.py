@@ -1,43 +1,77 @@
 import re
 import string
-import unicodedata
-from typing import Dict, List, Optional, Tuple
-
-from docx import Document
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+from src.data.normalize import strip_accents
 from src.docx_io.traverse import TextContainer, Location
 
-PLACEHOLDER_UNDERSCORES = re.compile(r"_{4,}")
-PLACEHOLDER_DOTS = re.compile(r"\.{4,}")
-PLACEHOLDER_DATE = re.compile(r"_{4,}/_{4,}/_{4,}")
-CHECKBOX_RE = re.compile(r"(\|_\||\[\s\]|\[x\]|\[X\]|☐|☑)")
-
+if TYPE_CHECKING:
+    from docx import Document
 
-def _line_spans(text: str) -> List[Tuple[int, int, str]]:
+# Date is listed first so it wins over a plain underscore run at the same position.
+PLACEHOLDER_RE = re.compile(r"(?P<date>_{4,}/_{4,}/_{4,})|(?P<underscores>_{4,})|(?P<dots>\.{4,})")
+CHECKBOX_RE = re.compile(r"(\|_\||\[\s\]|\[x\]|\[X\]|☐|☑)")
+_CHECKBOX_CLEAN_RE = re.compile(r"\|_\||\[ \]|\[x\]|\[X\]|☐|☑")
+# Same markers as CHECKBOX_RE, but "[ ]" may not straddle a line break.
+_CHECKBOX_OR_NEWLINE_RE = re.compile(r"\n|\|_\||\[[^\S\n]\]|\[x\]|\[X\]|☐|☑")
+
+_CHECKBOX_SEARCH = CHECKBOX_RE.search
+_PLACEHOLDER_FINDITER = PLACEHOLDER_RE.finditer
+_CHECKBOX_OR_NEWLINE_FINDITER = _CHECKBOX_OR_NEWLINE_RE.finditer
+_CHECKBOX_TOKENS = ("|_|", "[", "☐", "☑")
+_ROLE_PUNCT_TABLE = str.maketrans({ch: " " for ch in string.punctuation if ch != "%"})
+# Anchored lookaheads keep the original if/elif priority: the first alternative
+# whose pattern occurs anywhere in the text wins, regardless of match position.
+_ROLE_PATTERN_RE = re.compile(
+    r"\A(?:"
+    r"(?=.*subsemnatul.*reprezentant.*al)(?P<PERSON_THEN_ORG>)"
+    r"|(?=.*parafat.*banca.*ziua.*luna.*anul)(?P<ORG_THEN_DATE>)"
+    r"|(?=.*\(denumirea.*(?:ofertant|tert|operator))(?P<ORG_ONLY>)"
+    r"|(?=catre)(?P<CATRE_HEADER>)"
+    r"|(?=.*(?:suma.*%|penalitati.*%|reprezentand.*%))(?P<MONEY_PERCENT>)"
+    r")",
+    re.DOTALL,
+)
+_ROLE_PATTERN_MATCH = _ROLE_PATTERN_RE.match
+
+
+def _has_checkbox(text: str) -> bool:
+    if not any(tok in text for tok in _CHECKBOX_TOKENS):
+        return False
+    return _CHECKBOX_SEARCH(text) is not None
+
+
+def line_spans(text: str) -> List[Tuple[int, int, str]]:
     spans: List[Tuple[int, int, str]] = []
     cursor = 0
-    for line in text.splitlines(keepends=True):
-        start = cursor
-        end = cursor + len(line)
-        spans.append((start, end, line.rstrip("\n")))
-        cursor = end
-    if not spans:
-        spans.append((0, len(text), text))
-    return spans
-
-
-def _find_checkbox_spans(line: str) -> List[Tuple[int, int]]:
-    spans: List[Tuple[int, int]] = []
-    idx = 0
+    length = len(text)
+    find = text.find
     while True:
-        pos = line.find("|_|", idx)
-        if pos == -1:
-            break
-        spans.append((pos, pos + 3))
-        idx = pos + 3
-    for match in re.finditer(r"\[\s\]|\[x\]|\[X\]|☐|☑", line):
-        spans.append((match.start(), match.end()))
-    return spans
+        nl = find("\n", cursor)
+        if nl == -1:
+            if cursor < length or not spans:
+                spans.append((cursor, length, text[cursor:]))
+            return spans
+        spans.append((cursor, nl + 1, text[cursor:nl]))
+        cursor = nl + 1
+
+
+def _checkbox_lines(text: str) -> List[Tuple[str, List[Tuple[int, int]]]]:
+    lines: List[Tuple[str, List[Tuple[int, int]]]] = []
+    line_start = 0
+    boxes: List[Tuple[int, int]] = []
+    for match in _CHECKBOX_OR_NEWLINE_FINDITER(text):
+        start, end = match.span()
+        if text[start] == "\n":
+            if boxes:
+                lines.append((text[line_start:start], boxes))
+                boxes = []
+            line_start = end
+        else:
+            boxes.append((start, end))
+    if boxes:
+        lines.append((text[line_start:], boxes))
+    return lines
 
 
 def _location_to_dict(location: Location) -> Dict[str, object]:
@@ -55,69 +89,63 @@ def _location_to_dict(location: Location) -> Dict[str, object]:
 def _concat_runs(container: TextContainer) -> Tuple[str, List[Tuple[int, int]]]:
     paragraph = container.obj
     runs = getattr(paragraph, "runs", [])
+    texts = [run.text for run in runs]
     spans: List[Tuple[int, int]] = []
-    text = ""
-    for run in runs:
-        start = len(text)
-        text += run.text
-        end = len(text)
-        spans.append((start, end))
-    return text, spans
+    cursor = 0
+    for length in map(len, texts):
+        spans.append((cursor, cursor + length))
+        cursor += length
+    return "".join(texts), spans
 
 
 def _find_placeholder_spans(text: str) -> List[Tuple[int, int, str]]:
-    spans: List[Tuple[int, int, str]] = []
-    occupied = [False] * (len(text) + 1)
-
-    def _reserve(start: int, end: int) -> None:
-        for i in range(start, end):
-            occupied[i] = True
-
-    for match in PLACEHOLDER_DATE.finditer(text):
-        spans.append((match.start(), match.end(), match.group(0)))
-        _reserve(match.start(), match.end())
-
-    for regex in (PLACEHOLDER_UNDERSCORES, PLACEHOLDER_DOTS):
-        for match in regex.finditer(text):
-            if any(occupied[match.start() : match.end()]):
-                continue
-            spans.append((match.start(), match.end(), match.group(0)))
-            _reserve(match.start(), match.end())
-
-    spans.sort(key=lambda s: s[0])
-    return spans
+    # Every placeholder needs a run of four underscores or four dots.
+    if "____" not in text and "...." not in text:
+        return []
+    return [(m.start(), m.end(), m.group(0)) for m in _PLACEHOLDER_FINDITER(text)]
 
 
 def _extract_label_from_text(text: str, start: int) -> str:
-    before = text[:start]
-    lines = before.splitlines()
-    if not lines:
-        return ""
-    return lines[-1].strip(" :\t")
-
-
-def _get_table_cell_text(doc: Document, location: Location, col_offset: int) -> Optional[str]:
+    # A newline right before the placeholder is ignored, so a blank that opens
+    # a line is labelled by the line above it.
+    end = start - 1 if start and text[start - 1] == "\n" else start
+    line_start = text.rfind("\n", 0, end) + 1
+    return text[line_start:end].strip(" :\t")
+
+
+def _get_table_cell_text(
+    doc: "Document",
+    location: Location,
+    col_offset: int,
+    table_text_cache: Optional[Dict[Tuple, List[List[str]]]] = None,
+) -> Optional[str]:
     if location.table_idx is None or location.row is None or location.col is None:
         return None
     col_idx = location.col + col_offset
     if col_idx < 0:
         return None
-    if location.type == "header":
-        section = doc.sections[location.section_idx]
-        table = section.header.tables[location.table_idx]
-    elif location.type == "footer":
-        section = doc.sections[location.section_idx]
-        table = section.footer.tables[location.table_idx]
-    else:
-        table = doc.tables[location.table_idx]
-    if location.row >= len(table.rows) or col_idx >= len(table.rows[location.row].cells):
+    cache_key = (location.type, location.section_idx, location.table_idx)
+    matrix = table_text_cache.get(cache_key) if table_text_cache is not None else None
+    if matrix is None:
+        if location.type == "header":
+            section = doc.sections[location.section_idx]
+            table = section.header.tables[location.table_idx]
+        elif location.type == "footer":
+            section = doc.sections[location.section_idx]
+            table = section.footer.tables[location.table_idx]
+        else:
+            table = doc.tables[location.table_idx]
+        matrix = [[cell.text.strip() for cell in row.cells] for row in table.rows]
+        if table_text_cache is not None:
+            table_text_cache[cache_key] = matrix
+    if location.row >= len(matrix) or col_idx >= len(matrix[location.row]):
         return None
-    return table.rows[location.row].cells[col_idx].text.strip()
+    return matrix[location.row][col_idx]
 
 
 def extract_anchors(
     containers: List[TextContainer],
-    doc: Document,
+    doc: "Document",
 ) -> Tuple[List[Dict[str, object]], List[Dict[str, object]]]:
     anchors: List[Dict[str, object]] = []
     anchor_id = 1
@@ -126,6 +154,7 @@ def extract_anchors(
     checkbox_group_text: List[str] = []
     checkbox_group_location: Optional[Location] = None
     checkbox_gap = 0
+    table_text_cache: Dict[Tuple, List[List[str]]] = {}
 
     def _flush_checkbox_group() -> None:
         nonlocal anchor_id, checkbox_group, checkbox_group_text, checkbox_group_location
@@ -156,29 +185,19 @@ def extract_anchors(
             prev_text = None
             continue
 
-        if CHECKBOX_RE.search(text):
+        has_checkbox = _has_checkbox(text)
+        if has_checkbox:
             if not checkbox_group:
                 checkbox_group_location = container.location
             checkbox_group_text.append(text.strip())
             checkbox_gap = 0
-            for start, end, line in _line_spans(text):
-                if not CHECKBOX_RE.search(line):
-                    continue
-                spans = _find_checkbox_spans(line)
-                option_text = (
-                    line.replace("|_|", "")
-                    .replace("[ ]", "")
-                    .replace("[x]", "")
-                    .replace("[X]", "")
-                    .replace("☐", "")
-                    .replace("☑", "")
-                    .strip()
-                )
+            for line, spans in _checkbox_lines(text):
+                option_text = _CHECKBOX_CLEAN_RE.sub("", line).strip()
                 for s, e in spans:
                     checkbox_group.append(
                         {
                             "text": option_text,
-                            "span": {"start": start + s, "end": start + e},
+                            "span": {"start": s, "end": e},
                             "container": container,
                         }
                     )
@@ -198,7 +217,7 @@ def extract_anchors(
             label = _extract_label_from_text(text, start)
 
             if container.location.table_idx is not None and not label:
-                left_label = _get_table_cell_text(doc, container.location, -1)
+                left_label = _get_table_cell_text(doc, container.location, -1, table_text_cache)
                 if left_label:
                     label = left_label
 
@@ -259,15 +278,8 @@ def extract_anchors(
 
 
 def _normalize_role_text(value: str) -> str:
-    text = value.lower()
-    text = "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
-    allowed_punct = {"%"}
-    table = {
-        ch: " "
-        for ch in string.punctuation
-        if ch not in allowed_punct
-    }
-    text = text.translate(str.maketrans(table))
+    text = strip_accents(value.lower())
+    text = text.translate(_ROLE_PUNCT_TABLE)
     return " ".join(text.split())
 
 
@@ -275,17 +287,8 @@ def _assign_cluster(items: List[Dict[str, object]], cluster_id: int) -> Dict[str
     text_context = " ".join(str(i.get("nearby_text") or "") for i in items).strip()
     raw = text_context.lower()
     norm = _normalize_role_text(raw)
-    role_pattern = None
-    if re.search(r"subsemnatul.*reprezentant.*al", norm, re.DOTALL):
-        role_pattern = "PERSON_THEN_ORG"
-    elif re.search(r"parafat.*banca.*ziua.*luna.*anul", norm, re.DOTALL):
-        role_pattern = "ORG_THEN_DATE"
-    elif re.search(r"\(denumirea.*(ofertant|tert|operator)", norm, re.DOTALL):
-        role_pattern = "ORG_ONLY"
-    elif re.search(r"^catre", norm, re.DOTALL):
-        role_pattern = "CATRE_HEADER"
-    elif re.search(r"suma.*%|penalitati.*%|reprezentand.*%", norm, re.DOTALL):
-        role_pattern = "MONEY_PERCENT"
+    match = _ROLE_PATTERN_MATCH(norm)
+    role_pattern = match.lastgroup if match else None
 
     for item in items:
         item["cluster_id"] = cluster_id
@@ -4,37 +4,19 @@ from typing import Dict, Any, List, Tuple
 from docx.text.paragraph import Paragraph
 from rapidfuzz import process, fuzz
 
+from src.docx_io.anchors import line_spans
 from src.docx_io.fill_text import replace_span_across_runs
 from src.docx_io.traverse import TextContainer
 from src.data.normalize import normalize_key
 
 CHECKBOX_PATTERN = "|_|"
 CHECKBOX_MARKED = "|x|"
+_CHECKBOX_CLEAN_RE = re.compile(f"{re.escape(CHECKBOX_PATTERN)}|{re.escape(CHECKBOX_MARKED)}")
+_CHECKBOX_PATTERN_FINDITER = re.compile(re.escape(CHECKBOX_PATTERN)).finditer
 
 
 def _find_checkbox_occurrences(text: str) -> List[Tuple[int, int]]:
-    spans: List[Tuple[int, int]] = []
-    start = 0
-    while True:
-        idx = text.find(CHECKBOX_PATTERN, start)
-        if idx == -1:
-            break
-        spans.append((idx, idx + len(CHECKBOX_PATTERN)))
-        start = idx + len(CHECKBOX_PATTERN)
-    return spans
-
-
-def _line_spans(text: str) -> List[Tuple[int, int, str]]:
-    spans = []
-    cursor = 0
-    for line in text.splitlines(keepends=True):
-        start = cursor
-        end = cursor + len(line)
-        spans.append((start, end, line.rstrip("\n")))
-        cursor = end
-    if not spans:
-        spans.append((0, len(text), text))
-    return spans
+    return [m.span() for m in _CHECKBOX_PATTERN_FINDITER(text)]
 
 
 def _get_mapping_value(text: str, data: Dict[str, Any], mapping: Dict[str, str]) -> Any:
@@ -61,7 +43,7 @@ def fill_checkboxes_in_container(container: TextContainer, data: Dict[str, Any],
         return 0
     normalized = value.strip().lower()
 
-    line_spans = _line_spans(text)
+    lines = line_spans(text)
     checkbox_spans = _find_checkbox_occurrences(text)
     if not checkbox_spans:
         return 0
@@ -69,12 +51,15 @@ def fill_checkboxes_in_container(container: TextContainer, data: Dict[str, Any],
     groups: List[List[Tuple[str, Tuple[int, int]]]] = []
     current_group: List[Tuple[str, Tuple[int, int]]] = []
 
-    for start, end, line in line_spans:
+    # Both lists are ordered by position, so each box is consumed by exactly one line.
+    box_idx = 0
+    box_count = len(checkbox_spans)
+    for start, end, line in lines:
         if CHECKBOX_PATTERN in line:
-            option_text = line.replace(CHECKBOX_PATTERN, "").replace(CHECKBOX_MARKED, "").strip()
-            for s, e in checkbox_spans:
-                if s >= start and e <= end:
-                    current_group.append((option_text, (s, e)))
+            option_text = _CHECKBOX_CLEAN_RE.sub("", line).strip()
+            while box_idx < box_count and checkbox_spans[box_idx][1] <= end:
+                current_group.append((option_text, checkbox_spans[box_idx]))
+                box_idx += 1
         else:
             if current_group:
                 groups.append(current_group)
@@ -89,8 +74,8 @@ def fill_checkboxes_in_container(container: TextContainer, data: Dict[str, Any],
     best_global_score = 0
     best_span: Tuple[int, int] = (-1, -1)
     for group in groups:
-        option_texts = [o[0] for o in group]
-        best = process.extractOne(normalized, option_texts, scorer=fuzz.token_set_ratio)
+        option_texts = [o[0].lower() for o in group]
+        best = process.extractOne(normalized, option_texts, scorer=fuzz.token_set_ratio, processor=None)
         if not best:
             continue
         _, best_score, best_idx = best
@@ -119,18 +104,16 @@ def fill_checkbox_groups(anchors: List[Dict[str, Any]], data: Dict[str, Any], ma
         value = data.get(key) or data.get(normalize_key(key))
         if not isinstance(value, str):
             continue
-        normalized = value.strip().lower()
         options = anchor.get("options") or []
-        option_texts = [str(o.get("text") or "").strip() for o in options]
+        option_texts = [str(o.get("text") or "").strip().lower() for o in options]
         if not option_texts:
             continue
-        best = process.extractOne(normalized, option_texts, scorer=fuzz.token_set_ratio)
+        best = process.extractOne(
+            value.strip().lower(), option_texts, scorer=fuzz.token_set_ratio, processor=None, score_cutoff=70
+        )
         if not best:
             continue
-        _, best_score, best_idx = best
-        if best_score < 70:
-            continue
-        opt = options[best_idx]
+        opt = options[best[2]]
         span = opt.get("span") or {}
         container = opt.get("container")
         if not container:
@@ -12,11 +12,13 @@ def _cell_text(cell) -> str:
 
 
 def _row_is_empty(row: _Row) -> bool:
-    return all(not _cell_text(cell) for cell in row.cells)
+    # Normalized text is empty exactly when the raw text is all whitespace.
+    return all(not cell.text.strip() for cell in row.cells)
 
 
 def _clone_row(table: Table, row: _Row) -> _Row:
     tbl = table._tbl
+    # lxml copies the subtree natively; a tostring/parse_xml round trip is 2-3x slower.
     new_tr = copy.deepcopy(row._tr)
     tbl.append(new_tr)
     return _Row(new_tr, table)
@@ -48,9 +50,11 @@ def _header_map(row: _Row) -> Dict[int, str]:
     return headers
 
 
-def _match_columns(headers: Dict[int, str], sample_row: Dict[str, Any]) -> Dict[int, str]:
-    keys = list(sample_row.keys())
-    norm_keys = {normalize_key(k): k for k in keys}
+def _normalized_keys(sample_row: Dict[str, Any]) -> Dict[str, str]:
+    return {normalize_key(k): k for k in sample_row.keys()}
+
+
+def _match_columns(headers: Dict[int, str], norm_keys: Dict[str, str]) -> Dict[int, str]:
     mapping: Dict[int, str] = {}
     for col_idx, header_text in headers.items():
         norm_header = normalize_key(header_text)
@@ -88,34 +92,45 @@ def _is_subcontract_table(table: Table) -> bool:
     return _table_has_header(header, ["nr", "denumire subcontractant"])
 
 
-def _fill_table(table: Table, rows_data: List[Dict[str, Any]]) -> int:
-    if not rows_data or not table.rows:
+def _fill_table(
+    table: Table,
+    rows_data: List[Dict[str, Any]],
+    norm_keys: Optional[Dict[str, str]] = None,
+    col_map: Optional[Dict[int, str]] = None,
+) -> int:
+    if not rows_data:
         return 0
-    header_row = table.rows[0]
-    headers = _header_map(header_row)
-    col_map = _match_columns(headers, rows_data[0])
+    # table.rows and row.cells rebuild their lists from the XML on every access.
+    rows = list(table.rows)
+    if not rows:
+        return 0
+    if col_map is None:
+        if norm_keys is None:
+            norm_keys = _normalized_keys(rows_data[0])
+        col_map = _match_columns(_header_map(rows[0]), norm_keys)
     if not col_map:
         return 0
 
-    filled_tables = 0
-    filled_targets: set = set()
-    data_row_idx = 1 if len(table.rows) > 1 else None
+    filled = 0
+    data_row_idx = 1 if len(rows) > 1 else None
     for data_item in rows_data:
         target_row: Optional[_Row] = None
-        if data_row_idx is not None and data_row_idx < len(table.rows):
-            candidate = table.rows[data_row_idx]
+        if data_row_idx is not None and data_row_idx < len(rows):
+            candidate = rows[data_row_idx]
             if _row_is_empty(candidate):
                 target_row = candidate
                 data_row_idx += 1
         if target_row is None:
-            template_row = table.rows[1] if len(table.rows) > 1 else table.rows[0]
+            template_row = rows[1] if len(rows) > 1 else rows[0]
             target_row = _clone_row(table, template_row)
+            rows.append(target_row)
 
+        target_cells = target_row.cells
         for col_idx, key in col_map.items():
             value = data_item.get(key)
             if value is None:
                 continue
-            _set_cell_text_preserve(target_row.cells[col_idx], str(value))
+            _set_cell_text_preserve(target_cells[col_idx], str(value))
             filled += 1
 
     return filled
@@ -124,6 +139,9 @@ def _fill_table(table: Table, rows_data: List[Dict[str, Any]]) -> int:
 def fill_tables(doc: Document, data: Dict[str, Any]) -> int:
     filled = 0
     list_data = {k: v for k, v in data.items() if isinstance(v, list) and any(isinstance(i, dict) for i in v)}
+    dataset_norm_keys: List[Tuple[List[Dict[str, Any]], Dict[str, str]]] = [
+        (rows, _normalized_keys(rows[0])) for rows in list_data.values() if rows
+    ]
 
     for table in doc.tables:
         if not table.rows:
@@ -133,13 +151,11 @@ def fill_tables(doc: Document, data: Dict[str, Any]) -> int:
         if not headers:
             continue
         matched = False
-        for key, rows in list_data.items():
-            if not rows:
-                continue
-            col_map = _match_columns(headers, rows[0])
+        for rows, norm_keys in dataset_norm_keys:
+            col_map = _match_columns(headers, norm_keys)
             if not col_map:
                 continue
-            filled += _fill_table(table, rows)
+            filled += _fill_table(table, rows, col_map=col_map)
             matched = True
             break
         if matched:
@@ -157,6 +173,16 @@ def fill_tables_for_anchors(
     filled_tables = 0
     filled_targets: set = set()
     table_cache: Dict[int, Table] = {i: t for i, t in enumerate(doc.tables)}
+    # Header rows are never rewritten by _fill_table, so read them once up front.
+    table_headers: List[Tuple[int, Table, Dict[int, str]]] = []
+    for idx, table in table_cache.items():
+        rows = table.rows
+        if not rows:
+            continue
+        headers = _header_map(rows[0])
+        if headers:
+            table_headers.append((idx, table, headers))
+    col_map_cache: Dict[Tuple[int, Tuple[str, ...]], Dict[int, str]] = {}
 
     for anchor in anchors:
         if str(anchor.get("kind")) != "table":
@@ -171,19 +197,22 @@ def fill_tables_for_anchors(
         if not (isinstance(value, list) and any(isinstance(i, dict) for i in value)):
             continue
 
+        norm_keys = _normalized_keys(value[0])
         loc = anchor.get("location") or {}
         table_idx = loc.get("table_idx")
         target_table = table_cache.get(table_idx) if isinstance(table_idx, int) else None
+        target_col_map: Optional[Dict[int, str]] = None
 
         if target_table is None:
-            for table in doc.tables:
-                if not table.rows:
-                    continue
-                headers = _header_map(table.rows[0])
-                if not headers:
-                    continue
-                if _match_columns(headers, value[0]):
+            sample_keys = tuple(value[0].keys())
+            for idx, table, headers in table_headers:
+                cache_key = (idx, sample_keys)
+                col_map = col_map_cache.get(cache_key)
+                if col_map is None:
+                    col_map = col_map_cache[cache_key] = _match_columns(headers, norm_keys)
+                if col_map:
                     target_table = table
+                    target_col_map = col_map
                     break
 
         if target_table is None:
@@ -191,7 +220,7 @@ def fill_tables_for_anchors(
 
         if id(target_table) in filled_targets:
             continue
-        if _fill_table(target_table, value) > 0:
+        if _fill_table(target_table, value, norm_keys, target_col_map) > 0:
             filled_targets.add(id(target_table))
             filled_tables += 1
 
@@ -1,3 +1,6 @@
+import bisect
+from itertools import accumulate
+
 from docx.text.paragraph import Paragraph
 from src.docx_io.traverse import TextContainer
 
@@ -12,35 +15,26 @@ def replace_span_across_runs(
     if not runs or span_start >= span_end:
         return False
 
-    full_text = "".join(run.text for run in runs)
-    if span_start < 0 or span_end > len(full_text):
+    run_texts = [run.text for run in runs]
+    run_ends = list(accumulate(map(len, run_texts)))
+    if span_start < 0 or span_end > run_ends[-1]:
         return False
 
-    run_spans = []
-    current = 0
-    for run in runs:
-        run_text = run.text
-        run_end = current + len(run_text)
-        run_spans.append((current, run_end))
-        current = run_end
-
-    start_idx = None
-    end_idx = None
-    for idx, (s, e) in enumerate(run_spans):
-        if start_idx is None and s <= span_start < e:
-            start_idx = idx
-        if s < span_end <= e:
-            end_idx = idx
-            break
+    # First run with s <= span_start < e, first run with s < span_end <= e.
+    start_idx = bisect.bisect_right(run_ends, span_start)
+    end_idx = bisect.bisect_left(run_ends, span_end)
 
-    if start_idx is None or end_idx is None:
-        return False
+    if start_idx == end_idx and "\n" not in replacement:
+        run_text = run_texts[start_idx]
+        s = run_ends[start_idx] - len(run_text)
+        runs[start_idx].text = run_text[: span_start - s] + replacement + run_text[span_end - s :]
+        return True
 
     segments = replacement.split("\n")
     for idx in range(start_idx, end_idx + 1):
         run = runs[idx]
-        run_text = run.text
-        s, e = run_spans[idx]
+        run_text = run_texts[idx]
+        s = run_ends[idx] - len(run_text)
 
         prefix = ""
         suffix = ""
@@ -1,12 +1,12 @@
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import List, Optional
 
 from docx import Document
 from docx.text.paragraph import Paragraph
 from docx.table import _Cell, Table
 
 
-@dataclass
+@dataclass(slots=True)
 class TextContainer:
     kind: str
     obj: object
@@ -14,7 +14,7 @@ class TextContainer:
     location: "Location"
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     type: str
     section_idx: Optional[int] = None
@@ -25,10 +25,11 @@ class Location:
     paragraph_idx: Optional[int] = None
 
 
-def _iter_paragraphs_in_cell(
+def _collect_paragraphs_in_cell(
     cell: _Cell,
     location_base: Location,
-) -> Iterable[TextContainer]:
+    out: List[TextContainer],
+) -> None:
     for p_idx, paragraph in enumerate(cell.paragraphs):
         location = Location(
             type=location_base.type,
@@ -39,16 +40,17 @@ def _iter_paragraphs_in_cell(
             col=location_base.col,
             paragraph_idx=p_idx,
         )
-        yield TextContainer(kind="table", obj=paragraph, text=paragraph.text, location=location)
+        out.append(TextContainer(kind="table", obj=paragraph, text=paragraph.text, location=location))
     for t_idx, table in enumerate(cell.tables):
-        yield from _iter_table_paragraphs(table, location_base, table_idx=t_idx)
+        _collect_table_paragraphs(table, location_base, t_idx, out)
 
 
-def _iter_table_paragraphs(
+def _collect_table_paragraphs(
     table: Table,
     location_base: Location,
     table_idx: int,
-) -> Iterable[TextContainer]:
+    out: List[TextContainer],
+) -> None:
     for r_idx, row in enumerate(table.rows):
         for c_idx, cell in enumerate(row.cells):
             cell_location = Location(
@@ -59,45 +61,50 @@ def _iter_table_paragraphs(
                 row=r_idx,
                 col=c_idx,
             )
-            yield from _iter_paragraphs_in_cell(cell, cell_location)
+            _collect_paragraphs_in_cell(cell, cell_location, out)
 
 
-def _iter_section_paragraphs(doc: Document) -> Iterable[TextContainer]:
+def _collect_section_paragraphs(doc: Document, out: List[TextContainer]) -> None:
     for s_idx, section in enumerate(doc.sections):
+        header = section.header
         header_base = Location(type="header", section_idx=s_idx, header_footer="header")
-        for p_idx, paragraph in enumerate(section.header.paragraphs):
+        for p_idx, paragraph in enumerate(header.paragraphs):
             location = Location(
                 type="header",
                 section_idx=s_idx,
                 header_footer="header",
                 paragraph_idx=p_idx,
             )
-            yield TextContainer(kind="header_footer", obj=paragraph, text=paragraph.text, location=location)
-        for t_idx, table in enumerate(section.header.tables):
-            yield from _iter_table_paragraphs(table, header_base, table_idx=t_idx)
+            out.append(TextContainer(kind="header_footer", obj=paragraph, text=paragraph.text, location=location))
+        for t_idx, table in enumerate(header.tables):
+            _collect_table_paragraphs(table, header_base, t_idx, out)
 
+        footer = section.footer
         footer_base = Location(type="footer", section_idx=s_idx, header_footer="footer")
-        for p_idx, paragraph in enumerate(section.footer.paragraphs):
+        for p_idx, paragraph in enumerate(footer.paragraphs):
             location = Location(
                 type="footer",
                 section_idx=s_idx,
                 header_footer="footer",
                 paragraph_idx=p_idx,
             )
-            yield TextContainer(kind="header_footer", obj=paragraph, text=paragraph.text, location=location)
-        for t_idx, table in enumerate(section.footer.tables):
-            yield from _iter_table_paragraphs(table, footer_base, table_idx=t_idx)
+            out.append(TextContainer(kind="header_footer", obj=paragraph, text=paragraph.text, location=location))
+        for t_idx, table in enumerate(footer.tables):
+            _collect_table_paragraphs(table, footer_base, t_idx, out)
 
 
-def iter_blocks(doc: Document) -> Iterable[TextContainer]:
+def iter_blocks(doc: Document) -> List[TextContainer]:
+    # Not cached on the document: filling mutates it between traversals.
+    out: List[TextContainer] = []
     for p_idx, paragraph in enumerate(doc.paragraphs):
         location = Location(type="body", paragraph_idx=p_idx)
-        yield TextContainer(kind="paragraph", obj=paragraph, text=paragraph.text, location=location)
+        out.append(TextContainer(kind="paragraph", obj=paragraph, text=paragraph.text, location=location))
+    base = Location(type="body")
     for t_idx, table in enumerate(doc.tables):
-        base = Location(type="body")
-        yield from _iter_table_paragraphs(table, base, table_idx=t_idx)
-    yield from _iter_section_paragraphs(doc)
+        _collect_table_paragraphs(table, base, t_idx, out)
+    _collect_section_paragraphs(doc, out)
+    return out
 
 
-def iter_text_containers(doc: Document) -> Iterable[TextContainer]:
+def iter_text_containers(doc: Document) -> List[TextContainer]:
     return iter_blocks(doc)
@@ -1,5 +1,7 @@
+import bisect
 import hashlib
 import re
+from itertools import accumulate
 from typing import Dict, List, Any, Tuple, Optional
 
 from docx import Document
@@ -7,10 +9,14 @@ from docx import Document
 from src.docx_io.traverse import TextContainer, Location
 
 
-BLANK_UNDERSCORES = re.compile(r"_{2,}")
-BLANK_DOTS = re.compile(r"\.{4,}")
-BLANK_ELLIPSIS = re.compile(r"…{2,}")
-CHECKBOX_RE = re.compile(r"(\|_\||\[\s\]|\[x\]|\[X\]|☐|☑|□)")
+BLANK_RE = re.compile(
+    r"(?P<underscore>_{2,})"
+    r"|(?P<dots>\.{4,})"
+    r"|(?P<ellipsis>…{2,})"
+    r"|(?P<checkbox>\|_\||\[\s\]|\[x\]|\[X\]|☐|☑|□)"
+)
+# Shortest substring each BLANK_RE alternative needs in order to match.
+_BLANK_TRIGGERS = ("__", "....", "……", "|_|", "[", "☐", "☑", "□")
 
 
 def _location_to_dict(location: Location) -> Dict[str, object]:
@@ -25,55 +31,40 @@ def _location_to_dict(location: Location) -> Dict[str, object]:
     }
 
 
-def _concat_runs(container: TextContainer) -> str:
+def _run_texts(container: TextContainer) -> List[str]:
     paragraph = container.obj
     runs = getattr(paragraph, "runs", [])
-    text = ""
-    for run in runs:
-        text += run.text
-    return text
+    return [run.text for run in runs]
 
 
-def _run_spans(container: TextContainer) -> List[Tuple[int, int, int]]:
-    paragraph = container.obj
-    runs = getattr(paragraph, "runs", [])
-    spans: List[Tuple[int, int, int]] = []
-    cursor = 0
-    for idx, run in enumerate(runs):
-        start = cursor
-        cursor += len(run.text)
-        end = cursor
-        spans.append((idx, start, end))
-    return spans
+def _run_bounds(run_texts: List[str]) -> Tuple[List[int], List[int]]:
+    ends = list(accumulate(map(len, run_texts)))
+    starts = [0, *ends[:-1]] if ends else []
+    return starts, ends
 
 
 def _extract_spans_from_text(text: str) -> List[Tuple[int, int, str]]:
-    spans: List[Tuple[int, int, str]] = []
-    for m in BLANK_UNDERSCORES.finditer(text):
-        spans.append((m.start(), m.end(), "underscore"))
-    for m in BLANK_DOTS.finditer(text):
-        spans.append((m.start(), m.end(), "dots"))
-    for m in BLANK_ELLIPSIS.finditer(text):
-        spans.append((m.start(), m.end(), "ellipsis"))
-    for m in CHECKBOX_RE.finditer(text):
-        spans.append((m.start(), m.end(), "checkbox"))
-    spans.sort(key=lambda s: (s[0], s[1]))
-    return spans
+    if not any(tok in text for tok in _BLANK_TRIGGERS):
+        return []
+    # The alternatives match disjoint characters, so one pass yields the same
+    # spans as separate scans, already in positional order.
+    return [(m.start(), m.end(), m.lastgroup) for m in BLANK_RE.finditer(text)]
 
 
-def _make_slot_id(location: Dict[str, object], left: str, right: str, kind: str, raw: str) -> str:
+def _make_slot_id(location: str, left: str, right: str, kind: str, raw: str) -> str:
     raw_key = f"{location}|{left}|{right}|{kind}|{raw}"
-    return hashlib.sha1(raw_key.encode("utf-8")).hexdigest()[:16]
+    return hashlib.blake2b(raw_key.encode("utf-8"), digest_size=8).hexdigest()
 
 
 def extract_field_spans(containers: List[TextContainer], doc: Document) -> List[Dict[str, Any]]:
     spans: List[Dict[str, Any]] = []
     for container in containers:
-        paragraph_text = _concat_runs(container)
+        run_texts = _run_texts(container)
+        paragraph_text = "".join(run_texts)
         if not paragraph_text:
             if container.location.table_idx is not None:
                 location = _location_to_dict(container.location)
-                slot_id = _make_slot_id(location, "", "", "empty_cell", "")
+                slot_id = _make_slot_id(str(location), "", "", "empty_cell", "")
                 spans.append(
                     {
                         "span_id": slot_id,
@@ -95,23 +86,26 @@ def extract_field_spans(containers: List[TextContainer], doc: Document) -> List[
         raw_spans = _extract_spans_from_text(paragraph_text)
         if not raw_spans:
             continue
-        run_spans = _run_spans(container)
+        run_starts, run_ends = _run_bounds(run_texts)
+        run_count = len(run_starts)
+        # Every span in this paragraph shares one location dict and its repr.
+        location = _location_to_dict(container.location)
+        location_text = str(location)
+        paragraph_idx = container.location.paragraph_idx
         for idx, (start, end, kind) in enumerate(raw_spans):
             left_context = paragraph_text[max(0, start - 80) : start]
-            right_context = paragraph_text[end : min(len(paragraph_text), end + 80)]
+            right_context = paragraph_text[end : end + 80]
             raw_placeholder_text = paragraph_text[start:end]
-            run_start = None
-            run_end = None
-            for run_idx, r_start, r_end in run_spans:
-                if run_start is None and start >= r_start and start <= r_end:
-                    run_start = run_idx
-                if end >= r_start and end <= r_end:
-                    run_end = run_idx
-            location = _location_to_dict(container.location)
-            slot_id = _make_slot_id(location, left_context, right_context, kind, raw_placeholder_text)
+            # First run whose range contains start, last run whose range contains end
+            # (ranges are inclusive at both ends, so empty runs can also match).
+            run_start = bisect.bisect_left(run_ends, start)
+            if run_start >= run_count:
+                run_start = None
+            run_end = bisect.bisect_right(run_starts, end) - 1 if run_count else None
+            slot_id = _make_slot_id(location_text, left_context, right_context, kind, raw_placeholder_text)
             span = {
                 "span_id": slot_id,
-                "paragraph_idx": container.location.paragraph_idx,
+                "paragraph_idx": paragraph_idx,
                 "span_index": idx,
                 "start_char": start,
                 "end_char": end,
@@ -132,5 +126,5 @@ def extract_slots(docx_path: str) -> List[Dict[str, Any]]:
     doc = Document(docx_path)
     from src.docx_io.traverse import iter_text_containers
 
-    containers = list(iter_text_containers(doc))
+    containers = iter_text_containers(doc)
     return extract_field_spans(containers, doc)
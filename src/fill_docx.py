@@ -1,14 +1,48 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from docx import Document
 from docx.oxml import OxmlElement
 from docx.text.paragraph import Paragraph
 
-from src.docx_io.traverse import iter_text_containers
+from src.docx_io.traverse import Location, TextContainer, iter_text_containers
 from src.docx_io.fill_text import replace_span_across_runs
 from src.validate import is_date, is_money, infer_slot_type, value_matches_type
 
 
+_LOCATION_FIELDS = ("type", "section_idx", "header_footer", "table_idx", "row", "col", "paragraph_idx")
+
+
+def _location_key(location: Location) -> tuple:
+    return (
+        location.type,
+        location.section_idx,
+        location.header_footer,
+        location.table_idx,
+        location.row,
+        location.col,
+        location.paragraph_idx,
+    )
+
+
+def _location_dict_key(location: Dict[str, Any]) -> tuple:
+    try:
+        return (
+            location["type"],
+            location["section_idx"],
+            location["header_footer"],
+            location["table_idx"],
+            location["row"],
+            location["col"],
+            location["paragraph_idx"],
+        )
+    except KeyError:
+        return tuple(location.get(field) for field in _LOCATION_FIELDS)
+
+
+def build_location_map(doc: Document) -> Dict[tuple, TextContainer]:
+    return {_location_key(container.location): container for container in iter_text_containers(doc)}
+
+
 def fill_spans_in_docx(
     doc: Document,
     spans: List[Dict[str, Any]],
@@ -16,6 +50,7 @@ def fill_spans_in_docx(
     data_norm: Dict[str, Any],
     computed_values: Dict[str, Any],
     expected_types: Dict[str, str],
+    location_map: Optional[Dict[tuple, TextContainer]] = None,
 ) -> tuple[int, List[Dict[str, Any]]]:
     def _placeholder_only(paragraph: Paragraph, raw: str) -> bool:
         if raw is None:
@@ -34,38 +69,31 @@ def fill_spans_in_docx(
             new_para.add_run(text)
         return new_para
 
-    def _loc_key(location: Dict[str, Any]) -> tuple:
-        return (
-            location.get("type"),
-            location.get("section_idx"),
-            location.get("header_footer"),
-            location.get("table_idx"),
-            location.get("row"),
-            location.get("col"),
-            location.get("paragraph_idx"),
-        )
-
-    location_map = {}
-    for container in iter_text_containers(doc):
-        location_map[_loc_key(container.location.__dict__)] = container
+    if location_map is None:
+        location_map = build_location_map(doc)
 
-    spans_by_container: Dict[int, List[Dict[str, Any]]] = {}
+    spans_by_container: Dict[int, Tuple[TextContainer, List[Dict[str, Any]]]] = {}
     for span in spans:
         if span.get("blank_kind") == "checkbox":
             continue
         location = span.get("location")
         if not isinstance(location, dict):
             continue
-        container = location_map.get(_loc_key(location))
+        container = location_map.get(_location_dict_key(location))
         if not container:
             continue
-        spans_by_container.setdefault(id(container), []).append({**span, "_container": container})
+        group = spans_by_container.get(id(container))
+        if group is None:
+            group = spans_by_container[id(container)] = (container, [])
+        group[1].append(span)
 
     filled = 0
     suspicious: List[Dict[str, Any]] = []
-    for container_spans in spans_by_container.values():
-        container_spans.sort(key=lambda s: s.get("start_char", 0), reverse=True)
-        for span in container_spans:
+    for container, container_spans in spans_by_container.values():
+        paragraph = container.obj
+        # extract_field_spans emits each paragraph's spans in ascending start_char
+        # order; walk them backwards so earlier offsets stay valid after a fill.
+        for span in reversed(container_spans):
             span_id = span.get("span_id")
             if not span_id:
                 continue
@@ -96,7 +124,6 @@ def fill_spans_in_docx(
                     }
                 )
 
-            paragraph = span["_container"].obj
             raw_placeholder = span.get("raw_placeholder_text", "")
             value_text = str(value)
 
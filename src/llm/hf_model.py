@@ -1,11 +1,57 @@
+import copy
 import json
 import os
 import random
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig, StoppingCriteria, StoppingCriteriaList
+
+_JSON_DECODER = json.JSONDecoder()
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "Return ONLY strict JSON. No prose, no code fences.",
+}
+
+
+class _JsonObjectComplete(StoppingCriteria):
+    # Stops each row once its first top-level JSON object closes, scanning only
+    # the newest token per step.
+    def __init__(self, tokenizer, batch_size: int) -> None:
+        self.tokenizer = tokenizer
+        self.depth = [0] * batch_size
+        self.in_string = [False] * batch_size
+        self.escaped = [False] * batch_size
+        self.done = [False] * batch_size
+
+    def __call__(self, input_ids: torch.LongTensor, scores, **kwargs) -> torch.BoolTensor:
+        # A multibyte character split across byte-level BPE tokens decodes to U+FFFD
+        # piece by piece; that never hides a brace or quote, so counting stays exact.
+        pieces = self.tokenizer.batch_decode(input_ids[:, -1:], skip_special_tokens=True)
+        for row, piece in enumerate(pieces):
+            if self.done[row]:
+                continue
+            depth, in_string, escaped = self.depth[row], self.in_string[row], self.escaped[row]
+            for ch in piece:
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"' and depth:
+                    in_string = True
+                elif ch == "{":
+                    depth += 1
+                elif ch == "}" and depth:
+                    depth -= 1
+                    if not depth:
+                        self.done[row] = True
+                        break
+            self.depth[row], self.in_string[row], self.escaped[row] = depth, in_string, escaped
+        return torch.tensor(self.done, dtype=torch.bool, device=input_ids.device)
 
 
 class HFModel:
@@ -13,12 +59,18 @@ class HFModel:
         self,
         model_name: str = "Qwen/Qwen2.5-3B-Instruct",
         device_map: str = "auto",
-        seed: int = 42,
+        seed: Optional[int] = None,
         hf_token: Optional[str] = None,
+        enable_prefix_cache: bool = True,
+        compile_model: bool = False,
+        quantization: Optional[str] = None,
     ) -> None:
         self.model_name = model_name
         self.seed = seed
         self.device_map = device_map
+        self.enable_prefix_cache = enable_prefix_cache
+        self._prefix_ids: Optional[List[int]] = None
+        self._prefix_cache = None
         self._set_seed(seed)
         token = hf_token or os.getenv("HF_TOKEN") or os.getenv("HUGGINGFACE_HUB_TOKEN")
         self.tokenizer = AutoTokenizer.from_pretrained(model_name, token=token)
@@ -27,10 +79,40 @@ class HFModel:
             torch_dtype="auto",
             device_map=device_map,
             token=token,
+            quantization_config=self._quantization_config(quantization),
         )
+        # Decoder-only models continue from the last position, so pad batches on the left.
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        # reduce-overhead replays CUDA graphs, which need a static KV cache and
+        # stable input shapes; on CPU the eager model is kept.
+        self.compiled = compile_model and torch.cuda.is_available()
+        if self.compiled:
+            self.model.generation_config.cache_implementation = "static"
+            self.model.forward = torch.compile(self.model.forward, mode="reduce-overhead", fullgraph=True)
+        self.device = self.model.device
+
+    @staticmethod
+    def _quantization_config(quantization: Optional[str]) -> Optional[BitsAndBytesConfig]:
+        if quantization is None:
+            return None
+        if quantization == "int8":
+            return BitsAndBytesConfig(load_in_8bit=True)
+        if quantization == "int4":
+            return BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=torch.bfloat16,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_use_double_quant=True,
+            )
+        raise ValueError(f"Unsupported quantization: {quantization}")
 
     @staticmethod
-    def _set_seed(seed: int) -> None:
+    def _set_seed(seed: Optional[int]) -> None:
+        # Decoding is greedy, so seeding only matters to callers that ask for it.
+        if seed is None:
+            return
         random.seed(seed)
         np.random.seed(seed)
         torch.manual_seed(seed)
@@ -40,36 +122,75 @@ class HFModel:
     @staticmethod
     def _extract_json(text: str) -> str:
         start = text.find("{")
-        end = text.rfind("}")
-        if start == -1 or end == -1 or end <= start:
+        if start == -1:
             return "{}"
-        candidate = text[start : end + 1]
+        # raw_decode stops at the brace closing the first object, so trailing
+        # text or a second object no longer spoils the parse.
         try:
-            json.loads(candidate)
-            return candidate
+            _, end = _JSON_DECODER.raw_decode(text, start)
         except json.JSONDecodeError:
             return "{}"
+        return text[start:end]
+
+    def _to_device(self, encoded) -> Dict[str, torch.Tensor]:
+        if self.device.type != "cuda":
+            return {name: tensor.to(self.device) for name, tensor in encoded.items()}
+        # Pinned host buffers let the H2D copy run asynchronously on the stream
+        # instead of blocking the host before generate is queued.
+        return {name: tensor.pin_memory().to(self.device, non_blocking=True) for name, tensor in encoded.items()}
 
     def generate(self, prompt: str, max_new_tokens: int = 512) -> str:
-        messages = [
-            {
-                "role": "system",
-                "content": "Return ONLY strict JSON. No prose, no code fences.",
-            },
-            {"role": "user", "content": prompt},
+        return self.generate_batch([prompt], max_new_tokens=max_new_tokens)[0]
+
+    def _system_prefix(self) -> Tuple[List[int], object]:
+        # KV cache of the shared system turn, prefilled once and copied per call.
+        if self._prefix_cache is None:
+            prefix_text = self.tokenizer.apply_chat_template([_SYSTEM_MESSAGE], tokenize=False)
+            prefix_ids = self.tokenizer(prefix_text, return_tensors="pt")["input_ids"].to(self.device)
+            with torch.no_grad():
+                self._prefix_cache = self.model(input_ids=prefix_ids, use_cache=True).past_key_values
+            self._prefix_ids = prefix_ids[0].tolist()
+        return self._prefix_ids, self._prefix_cache
+
+    def generate_batch(self, prompts: List[str], max_new_tokens: int = 512) -> List[str]:
+        if not prompts:
+            return []
+        texts = [
+            self.tokenizer.apply_chat_template(
+                [_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+                tokenize=False,
+                add_generation_prompt=True,
+            )
+            for prompt in prompts
         ]
-        text = self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-        inputs = self.tokenizer([text], return_tensors="pt").to(self.model.device)
+        encoded = self.tokenizer(
+            texts,
+            return_tensors="pt",
+            padding=True,
+            pad_to_multiple_of=64 if self.compiled else None,
+        )
+        inputs = self._to_device(encoded)
+        extra = {}
+        # Left padding shifts the system turn per row, so the cached prefix only
+        # lines up for a single prompt.
+        if self.enable_prefix_cache and not self.compiled and len(prompts) == 1:
+            prefix_ids, prefix_cache = self._system_prefix()
+            input_ids = inputs["input_ids"][0]
+            if len(input_ids) > len(prefix_ids) and input_ids[: len(prefix_ids)].tolist() == prefix_ids:
+                extra["past_key_values"] = copy.deepcopy(prefix_cache)
         outputs = self.model.generate(
             **inputs,
+            **extra,
             max_new_tokens=max_new_tokens,
             do_sample=False,
             temperature=0.0,
             top_p=1.0,
+            pad_token_id=self.tokenizer.pad_token_id,
+            stopping_criteria=StoppingCriteriaList([_JsonObjectComplete(self.tokenizer, len(prompts))]),
         )
-        generated = outputs[0][inputs["input_ids"].shape[1] :]
-        decoded = self.tokenizer.decode(generated, skip_special_tokens=True)
-        return self._extract_json(decoded)
+        generated = outputs[:, inputs["input_ids"].shape[1] :]
+        decoded = self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+        return [self._extract_json(text) for text in decoded]
 
     def available(self) -> bool:
         return self.model is not None and self.tokenizer is not None
@@ -1,69 +1,84 @@
+import functools
 import json
 import re
 import string
-import unicodedata
-from typing import Dict, List, Any, Tuple, Optional
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Any, Tuple, Optional
 
+import numpy as np
 from rapidfuzz import process, fuzz
 
+from src.data.normalize import strip_accents
 from src.llm.hf_model import HFModel
 
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+_JSON_DECODER = json.JSONDecoder()
+# Bare labels are short and keys long; WRatio's partial matching is what pairs
+# them, so it stays the default despite being the slowest scorer.
+DEFAULT_LABEL_SCORER = fuzz.WRatio
+
+# Shared, byte-identical head of the key-choice prompts, so prefix caching
+# reuses its KV blocks across batches.
+_CHOOSE_KEY_PROMPT = (
+    "Return ONLY strict JSON with schema: "
+    '{"items":[{"anchor_id":"...","json_key":"...|null","confidence":0.0}]}.\n'
+    "Rules:\n"
+    "- Choose the single best JSON key from each anchor's candidates list.\n"
+    "- Prefer exact semantic match to the anchor label (Romanian).\n"
+    "- Respect expected_tags if present.\n"
+    "- If the label is a section title or not a field, use null.\n"
+    "- Confidence between 0.0 and 1.0.\n\n"
+    "Examples:\n"
+    "Label: 'Către' -> json_key: 'Catre - denumirea autoritatii contractante si adresa completa'\n"
+    "Label: 'reprezentanţi ai ofertantului' -> json_key: 'Denumirea / numele ofertantului'\n"
+    "Label: 'Data' -> json_key: 'Data'\n\n"
+)
+
+
+_TAG_KEYWORDS: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = [
+    (("money",), ("suma", "lei", "valoare", "tva", "taxa")),
+    (("percent",), ("%", "procent")),
+    (("date",), ("data", "ziua", "luna", "anul", "an")),
+    (("duration",), ("durata", "zile", "luni")),
+    (("validity",), ("valabil", "valabilitate")),
+    (("service",), ("servici", "furniz")),
+    (("payment",), ("plata", "termen", "conditii")),
+    (("penalty",), ("penalit", "doband")),
+    (("address",), ("adresa", "sediu", "domiciliu")),
+    (("bank",), ("banca", "asigur", "parafata")),
+    (("entity",), ("denumirea", "numele", "operator", "ofertant", "achizitor")),
+    (("authority",), ("autoritate", "catre")),
+    (("offer",), ("ofert",)),
+    (("subcontract",), ("subcontract",)),
+    (
+        ("person", "role"),
+        ("reprezentant", "imputernicit", "semnatar", "persoana", "nume", "functie", "director", "calitate", "dl", "dna"),
+    ),
+    (("id",), ("cif", "cnp", "registrul", "comert", "serie", "numar", "bi", "ci")),
+    (("process",), ("procedura", "contract", "achizitie")),
+]
+
+
+def _keyword_search(*words: str):
+    # One compiled alternation: a single scan instead of one substring probe per word.
+    return re.compile("|".join(map(re.escape, words))).search
+
+
+_TAG_SEARCHES = [(tags, _keyword_search(*words)) for tags, words in _TAG_KEYWORDS]
+
+
+@functools.lru_cache(maxsize=8192)
+def _tags_for_normalized(t: str) -> Tuple[str, ...]:
+    tags: List[str] = []
+    for group_tags, search in _TAG_SEARCHES:
+        if search(t):
+            tags.extend(group_tags)
+    return tuple(tags)
+
 
 def _infer_tags_from_text(text: str) -> List[str]:
-    t = _normalize_text(text)
-    tags: List[str] = []
-    if not t:
-        return tags
-    if any(x in t for x in ("suma", "lei", "valoare", "tva", "taxa")):
-        tags.append("money")
-    if any(x in t for x in ("%", "procent")):
-        tags.append("percent")
-    if any(x in t for x in ("data", "ziua", "luna", "anul", "an")):
-        tags.append("date")
-    if any(x in t for x in ("durata", "zile", "luni")):
-        tags.append("duration")
-    if any(x in t for x in ("valabil", "valabilitate")):
-        tags.append("validity")
-    if any(x in t for x in ("servici", "furniz")):
-        tags.append("service")
-    if any(x in t for x in ("plata", "termen", "conditii")):
-        tags.append("payment")
-    if any(x in t for x in ("penalit" , "doband")):
-        tags.append("penalty")
-    if any(x in t for x in ("adresa", "sediu", "domiciliu")):
-        tags.append("address")
-    if any(x in t for x in ("banca", "asigur", "parafata")):
-        tags.append("bank")
-    if any(x in t for x in ("denumirea", "numele", "operator", "ofertant", "achizitor")):
-        tags.append("entity")
-    if any(x in t for x in ("autoritate", "catre")):
-        tags.append("authority")
-    if "ofert" in t:
-        tags.append("offer")
-    if "subcontract" in t:
-        tags.append("subcontract")
-    if any(
-        x in t
-        for x in (
-            "reprezentant",
-            "imputernicit",
-            "semnatar",
-            "persoana",
-            "nume",
-            "functie",
-            "director",
-            "calitate",
-            "dl",
-            "dna",
-        )
-    ):
-        tags.append("person")
-        tags.append("role")
-    if any(x in t for x in ("cif", "cnp", "registrul", "comert", "serie", "numar", "bi", "ci")):
-        tags.append("id")
-    if any(x in t for x in ("procedura", "contract", "achizitie")):
-        tags.append("process")
-    return tags
+    # Callers get a fresh list; the cached tuple is shared.
+    return list(_tags_for_normalized(_normalize_text(text)))
 
 
 FIELD_TYPES = {
@@ -82,6 +97,23 @@ FIELD_TYPES = {
 }
 
 
+_DATE_PARTS_SEARCH = _keyword_search("ziua", "luna", "anul")
+_MONEY_SEARCH = _keyword_search("suma", "lei", "valoare", "tva", "taxa")
+_ADDRESS_SEARCH = _keyword_search("adresa", "sediu", "domiciliu")
+_PERSON_ADDRESS_SEARCH = _keyword_search("domiciliat", "cnp", "bi", "ci")
+_PERSON_NAME_SEARCH = _keyword_search("subsemnat", "reprezentant", "imputernicit", "semnatar", "dl", "dna", "functie")
+_ORG_NAME_SEARCH = _keyword_search("operator economic", "ofertant", "s.c", "societate")
+_ORG_ROLE_SEARCH = _keyword_search("banca", "autoritate", "achizitor", "contractant", "beneficiar")
+_NUMBER_SEARCH = _keyword_search("numar", "nr", "cif", "cnp", "cod", "serie", "bi", "ci")
+_KEY_DATE_PARTS_SEARCH = _keyword_search("zi", "luna", "an")
+_KEY_MONEY_SEARCH = _keyword_search("tva", "suma", "valoare", "lei")
+_KEY_ORG_ROLE_SEARCH = _keyword_search(
+    "operator", "ofertant", "autoritate", "societate", "achizitor", "s.c", "contractant", "beneficiar", "banca", "asigur"
+)
+_KEY_PERSON_NAME_SEARCH = _keyword_search("reprezentant", "imputernicit", "semnatar", "nume", "functie", "director")
+_KEY_ORG_NAME_SEARCH = _keyword_search("operator", "ofertant", "autoritate", "societate", "achizitor", "s.c")
+
+
 def _infer_field_type(anchor: Dict[str, object]) -> str:
     label = str(anchor.get("label_text") or "")
     nearby = str(anchor.get("nearby_text") or "")
@@ -96,108 +128,103 @@ def _infer_field_type(anchor: Dict[str, object]) -> str:
         return "CHECKBOX_GROUP"
     if "tabel" in text or "lista" in text:
         return "TABLE"
-    if any(x in text for x in ("ziua", "luna", "anul")):
+    if _DATE_PARTS_SEARCH(text):
         return "DATE_PARTS"
     if "/" in placeholder or "data" in text:
         return "DATE"
     if "%" in label or "procent" in text:
         return "PERCENT"
-    if any(x in text for x in ("suma", "lei", "valoare", "tva", "taxa")):
+    if _MONEY_SEARCH(text):
         return "MONEY"
-    if any(x in text for x in ("adresa", "sediu", "domiciliu")):
+    if _ADDRESS_SEARCH(text):
         return "ORG_ADDRESS"
-    if any(x in text for x in ("domiciliat", "cnp", "bi", "ci")):
+    if _PERSON_ADDRESS_SEARCH(text):
         return "PERSON_ADDRESS"
-    if any(x in text for x in ("subsemnat", "reprezentant", "imputernicit", "semnatar", "dl", "dna", "functie")):
+    if _PERSON_NAME_SEARCH(text):
         return "PERSON_NAME"
-    if any(x in text for x in ("operator economic", "ofertant", "s.c", "societate")):
+    if _ORG_NAME_SEARCH(text):
         return "ORG_NAME"
-    if any(x in text for x in ("banca", "autoritate", "achizitor", "contractant", "beneficiar")):
+    if _ORG_ROLE_SEARCH(text):
         return "ORG_NAME"
     if "cpv" in text:
         return "NUMBER"
-    if any(x in text for x in ("numar", "nr", "cif", "cnp", "cod", "serie", "bi", "ci")):
+    if _NUMBER_SEARCH(text):
         return "NUMBER"
     return "TEXT"
 
 
+@functools.lru_cache(maxsize=1024)
 def _infer_key_type(key: str) -> str:
     t = _normalize_text(key)
     if "tabel" in t or "lista" in t:
         return "TABLE"
-    if any(x in t for x in ("zi", "luna", "an")) and "data" in t:
+    if _KEY_DATE_PARTS_SEARCH(t) and "data" in t:
         return "DATE_PARTS"
     if "data" in t:
         return "DATE"
-    if any(x in t for x in ("tva", "suma", "valoare", "lei")):
+    if _KEY_MONEY_SEARCH(t):
         return "MONEY"
     if "%" in key or "procent" in t:
         return "PERCENT"
     if "cpv" in t:
         return "NUMBER"
-    if any(x in t for x in ("numar", "nr", "cif", "cnp", "cod", "serie", "bi", "ci")):
+    if _NUMBER_SEARCH(t):
         return "NUMBER"
-    if any(x in t for x in ("adresa", "sediu", "domiciliu")):
+    if _ADDRESS_SEARCH(t):
         return "ORG_ADDRESS"
-    if any(x in t for x in ("domiciliat", "cnp", "bi", "ci")):
+    if _PERSON_ADDRESS_SEARCH(t):
         return "PERSON_ADDRESS"
-    if any(x in t for x in ("operator", "ofertant", "autoritate", "societate", "achizitor", "s.c", "contractant", "beneficiar", "banca", "asigur")):
+    if _KEY_ORG_ROLE_SEARCH(t):
         if "denumire" in t or "nume" in t:
             return "ORG_NAME"
-    if any(x in t for x in ("reprezentant", "imputernicit", "semnatar", "nume", "functie", "director")):
+    if _KEY_PERSON_NAME_SEARCH(t):
         return "PERSON_NAME"
-    if any(x in t for x in ("operator", "ofertant", "autoritate", "societate", "achizitor", "s.c")):
+    if _KEY_ORG_NAME_SEARCH(t):
         return "ORG_NAME"
     return "TEXT"
 
 
+_DATE_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}/\d{4}\b")
+_MONEY_RE = re.compile(r"\b\d+[\d\s\.]*\b")
+_MONEY_VALUE_RE = re.compile(r"\b\d+[\d\s\.,]*\b")
+_PERCENT_NUM_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_NUM_RE = re.compile(r"\b\d+\b")
+
+
 def _value_matches_type(value: object, field_type: str) -> bool:
     if value is None:
         return True
     text = str(value)
     if field_type == "DATE":
-        return bool(re.search(r"\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}/\d{4}\b", text))
+        return bool(_DATE_RE.search(text))
     if field_type == "MONEY":
-        return bool(re.search(r"\b\d+[\d\s\.]*\b", text))
+        return bool(_MONEY_RE.search(text))
     if field_type == "PERCENT":
-        return "%" in text or bool(re.search(r"\b\d+(?:\.\d+)?\b", text))
+        return "%" in text or bool(_PERCENT_NUM_RE.search(text))
     if field_type == "NUMBER":
-        return bool(re.search(r"\b\d+\b", text))
+        return bool(_NUM_RE.search(text))
     return True
 
 
-def _type_compatible(field_type: str, key_type: str) -> bool:
-    if field_type == "TABLE":
-        return key_type == "TABLE"
-    if field_type == "CHECKBOX_GROUP":
-        return True
-    if field_type == "DATE":
-        return key_type == "DATE"
-    if field_type == "DATE_PARTS":
-        return key_type in {"DATE", "DATE_PARTS"}
-    if field_type == "MONEY":
-        return key_type in {"MONEY", "NUMBER"}
-    if field_type == "PERCENT":
-        return key_type in {"PERCENT", "NUMBER"}
-    if field_type == "NUMBER":
-        return key_type in {"NUMBER", "MONEY", "PERCENT"}
-    if field_type == "PERSON_NAME":
-        return key_type == "PERSON_NAME"
-    if field_type == "PERSON_ADDRESS":
-        return key_type == "PERSON_ADDRESS"
-    if field_type == "ORG_NAME":
-        return key_type == "ORG_NAME"
-    if field_type == "ORG_ADDRESS":
-        return key_type == "ORG_ADDRESS"
-    return True
+# Key types each field type accepts; field types not listed (TEXT,
+# CHECKBOX_GROUP) accept any key.
+_COMPATIBLE_KEY_TYPES: Dict[str, FrozenSet[str]] = {
+    "TABLE": frozenset({"TABLE"}),
+    "DATE": frozenset({"DATE"}),
+    "DATE_PARTS": frozenset({"DATE", "DATE_PARTS"}),
+    "MONEY": frozenset({"MONEY", "NUMBER"}),
+    "PERCENT": frozenset({"PERCENT", "NUMBER"}),
+    "NUMBER": frozenset({"NUMBER", "MONEY", "PERCENT"}),
+    "PERSON_NAME": frozenset({"PERSON_NAME"}),
+    "PERSON_ADDRESS": frozenset({"PERSON_ADDRESS"}),
+    "ORG_NAME": frozenset({"ORG_NAME"}),
+    "ORG_ADDRESS": frozenset({"ORG_ADDRESS"}),
+}
 
 
-def _context_score(field_type: str, key_type: str) -> float:
-    if field_type == "TABLE":
-        return 1.0 if key_type == "TABLE" else 0.0
-    if key_type == "TABLE":
-        return 0.0
-    return 1.0
+def _type_compatible(field_type: str, key_type: str) -> bool:
+    allowed = _COMPATIBLE_KEY_TYPES.get(field_type)
+    return allowed is None or key_type in allowed
 
 
 def _score_candidate(
@@ -224,28 +251,95 @@ def _parse_llm_candidates(response: str) -> List[Dict[str, Any]]:
     return items
 
 
+def _score_matrix(queries: List[str], choices: List[str], scorer) -> np.ndarray:
+    # Templates repeat labels, so score each distinct query once and expand.
+    unique_rows: Dict[str, int] = {}
+    rows = [unique_rows.setdefault(query, len(unique_rows)) for query in queries]
+    # float64 keeps scores identical to process.extract. Inputs arrive through
+    # _normalize_text, so no processor pass is needed.
+    scores = process.cdist(list(unique_rows), choices, scorer=scorer, processor=None, dtype=np.float64, workers=-1)
+    return scores[rows]
+
+
+def _top_matches(row: np.ndarray, limit: int) -> List[Tuple[int, float]]:
+    # Same order as process.extract: score descending, ties by choice position.
+    order = np.argsort(-row, kind="stable")[:limit]
+    return [(int(idx), float(row[idx])) for idx in order]
+
+
+@functools.lru_cache(maxsize=8192)
 def _normalize_text(value: str) -> str:
-    text = value.lower()
-    text = "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
-    text = text.translate(str.maketrans("", "", string.punctuation))
+    text = strip_accents(value.lower())
+    text = text.translate(_PUNCT_TABLE)
     return " ".join(text.split())
 
 
+@dataclass(slots=True)
+class _KeyIndex:
+    norm_keys: List[str]
+    key_tags: Dict[str, List[str]]
+    # tag -> positions of the keys carrying it, in data_keys order.
+    tag_index: Dict[str, List[int]]
+    key_types: Dict[str, str]
+    # First key normalizing to "data", for the exact "Data" label shortcut.
+    data_key: Optional[str]
+
+
+@functools.lru_cache(maxsize=4)
+def _prepare_keys(data_keys: Tuple[str, ...]) -> _KeyIndex:
+    # Shared across calls; callers must treat the results as read-only.
+    norm_keys = [_normalize_text(k) for k in data_keys]
+    key_tags = {k: _infer_tags_from_text(k) for k in data_keys}
+    tag_index: Dict[str, List[int]] = {}
+    for idx, key in enumerate(data_keys):
+        for tag in key_tags[key]:
+            tag_index.setdefault(tag, []).append(idx)
+    return _KeyIndex(
+        norm_keys=norm_keys,
+        key_tags=key_tags,
+        tag_index=tag_index,
+        key_types={k: _infer_key_type(k) for k in data_keys},
+        data_key=next((k for k, nk in zip(data_keys, norm_keys) if nk == "data"), None),
+    )
+
+
+def _anchor_text_scores(
+    anchors: List[Dict[str, object]],
+    data_keys: List[str],
+) -> Tuple[Dict[int, int], np.ndarray]:
+    # token_set_ratio of every anchor's label+nearby text against every key, in
+    # one call; rows are keyed by anchor position.
+    norm_keys = _prepare_keys(tuple(data_keys)).norm_keys
+    queries: List[str] = []
+    query_rows: Dict[int, int] = {}
+    for pos, anchor in enumerate(anchors):
+        label = str(anchor.get("label_text") or "")
+        if not anchor.get("anchor_id") or not label:
+            continue
+        norm_label = _normalize_text(label)
+        norm_nearby = _normalize_text(str(anchor.get("nearby_text") or ""))
+        query_rows[pos] = len(queries)
+        queries.append(" ".join([t for t in (norm_label, norm_nearby) if t]))
+    return query_rows, _score_matrix(queries, norm_keys, fuzz.token_set_ratio)
+
+
 def _heuristic_mapping(
     anchors: List[Dict[str, object]],
     data_norm: Dict[str, Any],
     data_keys: List[str],
     llm_candidates: Optional[Dict[str, List[str]]] = None,
     threshold: float = 0.6,
+    text_scores: Optional[Tuple[Dict[int, int], np.ndarray]] = None,
 ) -> Dict[str, Dict[str, object]]:
-    norm_keys = [_normalize_text(k) for k in data_keys]
+    keys = _prepare_keys(tuple(data_keys))
+    tag_index, key_types, exact_data_key = keys.tag_index, keys.key_types, keys.data_key
     mapping: Dict[str, Dict[str, object]] = {}
-
-    key_tags = {k: _infer_tags_from_text(k) for k in data_keys}
-    key_types = {k: _infer_key_type(k) for k in data_keys}
     llm_candidates = llm_candidates or {}
 
-    for anchor in anchors:
+    # Each anchor reads only the columns of its tag-filtered keys.
+    query_rows, scores = text_scores or _anchor_text_scores(anchors, data_keys)
+
+    for pos, anchor in enumerate(anchors):
         label = str(anchor.get("label_text") or "")
         nearby = str(anchor.get("nearby_text") or "")
         anchor_id = str(anchor.get("anchor_id") or "")
@@ -256,70 +350,50 @@ def _heuristic_mapping(
         if not norm_label and not norm_nearby:
             continue
         field_type = _infer_field_type(anchor)
-        if norm_label == "data":
-            exact_key = next((k for k in data_keys if _normalize_text(k) == "data"), None)
-            if exact_key:
-                mapping[anchor_id] = {
-                    "label_text": label,
-                    "json_key": exact_key,
-                    "score": 100.0,
-                    "ambiguous": False,
-                    "field_type": field_type,
-                }
-                continue
+        if norm_label == "data" and exact_data_key:
+            mapping[anchor_id] = {
+                "label_text": label,
+                "json_key": exact_data_key,
+                "score": 100.0,
+                "ambiguous": False,
+                "field_type": field_type,
+            }
+            continue
         label_tags = set(_infer_tags_from_text(label + " " + nearby))
-        filtered_keys = [k for k in data_keys if (not label_tags) or (label_tags & set(key_tags.get(k, [])))]
-        filtered_norm_keys = [_normalize_text(k) for k in filtered_keys]
-        candidates = [norm_label]
-        if norm_nearby:
-            candidates.append(norm_nearby)
-        matches = process.extract(
-            " ".join(candidates),
-            filtered_norm_keys or norm_keys,
-            scorer=fuzz.token_set_ratio,
-            limit=10,
-        )
+        if label_tags:
+            filtered_idx = sorted(set().union(*(tag_index.get(tag, ()) for tag in label_tags)))
+        else:
+            filtered_idx = list(range(len(data_keys)))
+        filtered_keys = [data_keys[i] for i in filtered_idx]
+        row = scores[query_rows[pos]]
+        matches = _top_matches(row[filtered_idx] if filtered_idx else row, 10)
         if not matches:
             continue
         base_candidates: List[Tuple[str, float]] = []
-        for _, score, idx in matches:
-            base_candidates.append(((filtered_keys or data_keys)[idx], float(score) / 100.0))
-
-        extra = llm_candidates.get(anchor_id, [])
-        all_candidates: List[Tuple[str, float]] = base_candidates + [(k, 0.5) for k in extra if k in data_keys]
-        seen = set()
-        deduped: List[Tuple[str, float]] = []
-        for k, s in all_candidates:
-            if k in seen:
-                continue
-            seen.add(k)
-            deduped.append((k, s))
+        for idx, score in matches:
+            base_candidates.append(((filtered_keys or data_keys)[idx], score / 100.0))
+
+        # Fuzzy matches are already distinct; first occurrence wins for extras.
+        deduped: Dict[str, float] = dict(base_candidates)
+        for k in llm_candidates.get(anchor_id, []):
+            if k in data_keys:
+                deduped.setdefault(k, 0.5)
 
         best_key = None
         best_score = 0.0
-        for key, sim in deduped:
+        for key, sim in deduped.items():
             key_type = key_types.get(key, "TEXT")
+            value = data_norm.get(key)
             if field_type == "TABLE":
-                value = data_norm.get(key)
                 if not isinstance(value, list) or not any(isinstance(v, dict) for v in value):
                     continue
-            value = data_norm.get(key)
-            if field_type != "TABLE" and isinstance(value, (list, dict)):
-                continue
-            if field_type == "DATE" and key_type != "DATE":
-                continue
-            if field_type in {"MONEY", "PERCENT", "NUMBER"}:
-                if not _value_matches_type(data_norm.get(key), field_type):
-                    continue
-            if field_type == "PERSON_NAME" and key_type != "PERSON_NAME":
+            elif isinstance(value, (list, dict)):
                 continue
-            if field_type == "PERSON_ADDRESS" and key_type != "PERSON_ADDRESS":
+            if field_type in {"MONEY", "PERCENT", "NUMBER"} and not _value_matches_type(value, field_type):
                 continue
-            if field_type == "ORG_NAME" and key_type != "ORG_NAME":
-                continue
-            if field_type == "ORG_ADDRESS" and key_type != "ORG_ADDRESS":
-                continue
-            if field_type not in {"TEXT", "CHECKBOX_GROUP"} and not _type_compatible(field_type, key_type):
+            # Covers the exact-type rules for DATE, PERSON_* and ORG_*; TEXT and
+            # CHECKBOX_GROUP accept any key type.
+            if not _type_compatible(field_type, key_type):
                 continue
 
             score = _score_candidate(sim, field_type, key_type, label, nearby, key)
@@ -341,11 +415,14 @@ def _heuristic_mapping(
 
 
 def _extract_json(text: str) -> Dict[str, str]:
-    match = re.search(r"\{.*\}", text, re.DOTALL)
-    if not match:
+    start = text.find("{")
+    if start == -1:
         return {}
+    # First balanced object from the first "{": raw_decode tracks strings and
+    # nesting in C and ignores whatever follows. Any span the old first "{" to
+    # last "}" slice could parse decodes to the same object.
     try:
-        return json.loads(match.group(0))
+        return _JSON_DECODER.raw_decode(text, start)[0]
     except json.JSONDecodeError:
         return {}
 
@@ -388,6 +465,7 @@ def llm_suggest_candidates(
         return {}
 
     results: Dict[str, List[Dict[str, Any]]] = {}
+    prompts: List[str] = []
     for i in range(0, len(ambiguous), batch_size):
         batch = ambiguous[i : i + batch_size]
         batch_payload = [
@@ -398,7 +476,7 @@ def llm_suggest_candidates(
             }
             for a in batch
         ]
-        prompt = (
+        prompts.append(
             "Return ONLY strict JSON with schema: "
             '{"items":[{"anchor_id":"...","candidates":[{"key":"...","confidence":0.0}]}]}.\n'
             "Rules:\n"
@@ -408,7 +486,9 @@ def llm_suggest_candidates(
             f"Keys: {data_keys}\n\n"
             f"Anchors: {batch_payload}\n"
         )
-        response = model.generate(prompt)
+
+    # One padded generate call covers every batch.
+    for response in model.generate_batch(prompts):
         parsed = _parse_llm_candidates(response)
         for item in parsed:
             anchor_id = str(item.get("anchor_id") or "")
@@ -431,15 +511,33 @@ def llm_suggest_candidates(
     return results
 
 
-def _context_score(label: str, nearby: str, key: str) -> float:
-    label_tokens = set(_normalize_text(label).split())
-    nearby_tokens = set(_normalize_text(nearby).split())
-    key_tokens = set(_normalize_text(key).split())
-    tokens = label_tokens | nearby_tokens
+@functools.lru_cache(maxsize=8192)
+def _text_tokens(text: str) -> FrozenSet[str]:
+    return frozenset(_normalize_text(text).split())
+
+
+def _token_overlap(tokens: FrozenSet[str], key_tokens: FrozenSet[str]) -> float:
     if not tokens or not key_tokens:
         return 0.0
-    overlap = tokens & key_tokens
-    return min(1.0, len(overlap) / max(1, len(key_tokens)))
+    return min(1.0, len(tokens & key_tokens) / max(1, len(key_tokens)))
+
+
+def _context_score(label: str, nearby: str, key: str) -> float:
+    return _token_overlap(_text_tokens(label) | _text_tokens(nearby), _text_tokens(key))
+
+
+def _numericish_short(v: Any, max_len: int = 10) -> bool:
+    if isinstance(v, (int, float)):
+        return True
+    if not isinstance(v, str):
+        return False
+    text = v.strip()
+    if len(text) > max_len:
+        return False
+    if len(text.split()) > 2:
+        return False
+    cleaned = text.replace("%", "").replace(".", "").replace(",", "")
+    return cleaned.isdigit()
 
 
 def _hard_gate(
@@ -454,19 +552,6 @@ def _hard_gate(
     norm_key = _normalize_text(key)
     norm_label = _normalize_text(label)
 
-    def _numericish_short(v: Any, max_len: int = 10) -> bool:
-        if isinstance(v, (int, float)):
-            return True
-        if not isinstance(v, str):
-            return False
-        text = v.strip()
-        if len(text) > max_len:
-            return False
-        if len(text.split()) > 2:
-            return False
-        cleaned = text.replace("%", "").replace(".", "").replace(",", "")
-        return cleaned.isdigit()
-
     if "catre" in norm_label:
         allowed = (
             "catre",
@@ -480,7 +565,7 @@ def _hard_gate(
             return False
 
     if field_type in {"DATE", "DATE_PARTS"}:
-        if isinstance(value, str) and re.search(r"\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}/\d{4}\b", value):
+        if isinstance(value, str) and _DATE_RE.search(value):
             return True
         return False
 
@@ -503,7 +588,7 @@ def _hard_gate(
             return True
         if isinstance(value, str):
             v = value.lower()
-            if re.search(r"\b\d+[\d\s\.,]*\b", v) and ("lei" in v or "ron" in v or v.strip().replace(".", "").replace(",", "").isdigit()):
+            if _MONEY_VALUE_RE.search(v) and ("lei" in v or "ron" in v or v.strip().replace(".", "").replace(",", "").isdigit()):
                 return True
         return False
 
@@ -578,20 +663,22 @@ def _build_candidates(
     data_norm: Dict[str, Any],
     data_keys: List[str],
     llm_candidates: Dict[str, List[Dict[str, Any]]],
+    text_scores: Optional[Tuple[Dict[int, int], np.ndarray]] = None,
 ) -> Dict[str, List[Dict[str, Any]]]:
-    key_types = {k: _infer_key_type(k) for k in data_keys}
+    key_types = _prepare_keys(tuple(data_keys)).key_types
     candidates: Dict[str, List[Dict[str, Any]]] = {}
 
-    for anchor in anchors:
+    query_rows, scores = text_scores or _anchor_text_scores(anchors, data_keys)
+    for pos, anchor in enumerate(anchors):
+        if pos not in query_rows:
+            continue
+        row = scores[query_rows[pos]]
         anchor_id = str(anchor.get("anchor_id") or "")
         label = str(anchor.get("label_text") or "")
         nearby = str(anchor.get("nearby_text") or "")
-        if not anchor_id or not label:
-            continue
         field_type = _infer_field_type(anchor)
-        query = " ".join([_normalize_text(label), _normalize_text(nearby)]).strip()
-        matches = process.extract(query, [_normalize_text(k) for k in data_keys], scorer=fuzz.token_set_ratio, limit=10)
-        base: List[Tuple[str, float]] = [(data_keys[idx], float(score) / 100.0) for _, score, idx in matches]
+        anchor_tokens = _text_tokens(label) | _text_tokens(nearby)
+        base: List[Tuple[str, float]] = [(data_keys[idx], score / 100.0) for idx, score in _top_matches(row, 10)]
 
         llm_list = llm_candidates.get(anchor_id, [])
         llm_map = {c.get("key"): float(c.get("confidence") or 0.0) for c in llm_list if isinstance(c, dict)}
@@ -612,7 +699,7 @@ def _build_candidates(
                 continue
             key_type = key_types.get(key, "TEXT")
             score_type = 1.0 if _type_compatible(field_type, key_type) else 0.0
-            score_context = _context_score(label, nearby, key)
+            score_context = _token_overlap(anchor_tokens, _text_tokens(key))
             score_role = _role_bias(field_type, label, nearby, key)
             total = (
                 0.45 * meta.get("score_text", 0.0)
@@ -674,12 +761,8 @@ def solve_global_mapping(
             mapping_final[anchor_id] = best["key"]
             chosen_scores[anchor_id] = best["total"]
 
-    def _is_incompatible(t1: str, t2: str) -> bool:
-        person_types = {"PERSON_NAME", "PERSON_ADDRESS"}
-        org_types = {"ORG_NAME", "ORG_ADDRESS"}
-        if (t1 in person_types and t2 in org_types) or (t2 in person_types and t1 in org_types):
-            return True
-        return False
+    person_types = {"PERSON_NAME", "PERSON_ADDRESS"}
+    org_types = {"ORG_NAME", "ORG_ADDRESS"}
 
     def _anchor_keywords(a: Dict[str, object], tokens: Tuple[str, ...]) -> bool:
         text = _normalize_text(str(a.get("label_text") or "") + " " + str(a.get("nearby_text") or ""))
@@ -688,50 +771,69 @@ def solve_global_mapping(
     conflicts_found = 0
     repairs_made = 0
 
+    # Sections, their keyword requirements and each anchor's top-candidate type
+    # do not change between repair rounds.
+    best_type = {aid: cl[0].get("field_type") for aid, cl in candidates.items() if cl}
+    anchor_section = {aid: _section_id(a) for aid, a in anchor_map.items()}
+    section_anchors: Dict[Tuple, List[Dict[str, object]]] = {}
+    for a in anchors:
+        section_anchors.setdefault(_section_id(a), []).append(a)
+    section_requirements: List[Tuple[bool, bool, List[object]]] = []
+    for sec_anchors in section_anchors.values():
+        section_requirements.append(
+            (
+                any(_anchor_keywords(a, ("operator economic", "denumirea numele")) for a in sec_anchors),
+                any(_anchor_keywords(a, ("subsemnat",)) for a in sec_anchors),
+                [a.get("anchor_id") for a in sec_anchors if a.get("anchor_id")],
+            )
+        )
+
     for _ in range(3):
         conflict_anchors: List[str] = []
 
         # Type collisions per section
         section_to_keys: Dict[Tuple, Dict[str, List[str]]] = {}
         for aid, key in mapping_final.items():
-            a = anchor_map.get(aid)
-            if not a:
+            sec = anchor_section.get(aid)
+            if sec is None:
                 continue
-            sec = _section_id(a)
             section_to_keys.setdefault(sec, {}).setdefault(key, []).append(aid)
 
         for sec, key_map in section_to_keys.items():
             for key, aids in key_map.items():
                 if len(aids) < 2:
                     continue
-                types = [candidates[aid][0]["field_type"] for aid in aids if candidates.get(aid)]
-                for i in range(len(types)):
-                    for j in range(i + 1, len(types)):
-                        if _is_incompatible(types[i], types[j]):
-                            conflict_anchors.extend([aids[i], aids[j]])
-
-        # Section requirements
-        for sec in { _section_id(a) for a in anchors }:
-            sec_anchors = [a for a in anchors if _section_id(a) == sec]
-            if any(_anchor_keywords(a, ("operator economic", "denumirea numele")) for a in sec_anchors):
-                has_org = any(
-                    candidates.get(aid, [{}])[0].get("field_type") == "ORG_NAME"
-                    and aid in mapping_final
-                    and any(tok in _normalize_text(mapping_final[aid]) for tok in ("ofertant", "operator economic", "contractant"))
-                    for aid in mapping_final
-                )
+                # Every person/org pair collides, so each side conflicts as soon
+                # as the other side is non-empty.
+                person_aids = [aid for aid in aids if best_type.get(aid) in person_types]
+                org_aids = [aid for aid in aids if best_type.get(aid) in org_types]
+                if person_aids and org_aids:
+                    conflict_anchors.extend(person_aids + org_aids)
+
+        # Section requirements; the checks read the whole mapping, so they are
+        # evaluated at most once per round.
+        has_org: Optional[bool] = None
+        has_person: Optional[bool] = None
+        for needs_org, needs_person, sec_ids in section_requirements:
+            if needs_org:
+                if has_org is None:
+                    has_org = any(
+                        best_type.get(aid) == "ORG_NAME"
+                        and any(tok in _normalize_text(mapping_final[aid]) for tok in ("ofertant", "operator economic", "contractant"))
+                        for aid in mapping_final
+                    )
                 if not has_org:
-                    conflict_anchors.extend([a.get("anchor_id") for a in sec_anchors if a.get("anchor_id")])
-
-            if any(_anchor_keywords(a, ("subsemnat" ,)) for a in sec_anchors):
-                has_person = any(
-                    candidates.get(aid, [{}])[0].get("field_type") == "PERSON_NAME"
-                    and aid in mapping_final
-                    and any(tok in _normalize_text(mapping_final[aid]) for tok in ("imputernicit", "subsemnat", "reprezentant"))
-                    for aid in mapping_final
-                )
+                    conflict_anchors.extend(sec_ids)
+
+            if needs_person:
+                if has_person is None:
+                    has_person = any(
+                        best_type.get(aid) == "PERSON_NAME"
+                        and any(tok in _normalize_text(mapping_final[aid]) for tok in ("imputernicit", "subsemnat", "reprezentant"))
+                        for aid in mapping_final
+                    )
                 if not has_person:
-                    conflict_anchors.extend([a.get("anchor_id") for a in sec_anchors if a.get("anchor_id")])
+                    conflict_anchors.extend(sec_ids)
 
         if not conflict_anchors:
             break
@@ -771,6 +873,13 @@ def solve_global_mapping(
                 return cand.get("key")
         return None
 
+    # key -> field type of its first candidate entry, per anchor.
+    candidate_types: Dict[str, Dict[str, Any]] = {}
+    for aid, cand_list in candidates.items():
+        types_by_key = candidate_types[aid] = {}
+        for cand in cand_list:
+            types_by_key.setdefault(cand.get("key"), cand.get("field_type"))
+
     clusters: Dict[int, List[Dict[str, object]]] = {}
     for a in anchors:
         cid = a.get("cluster_id")
@@ -794,12 +903,7 @@ def solve_global_mapping(
                     continue
                 required = ("PERSON_NAME",) if pos == 0 else ("ORG_NAME", "ORG_ADDRESS")
                 current = mapping_final.get(aid)
-                current_type = None
-                if current:
-                    for cand in candidates.get(aid, []):
-                        if cand.get("key") == current:
-                            current_type = cand.get("field_type")
-                            break
+                current_type = candidate_types.get(aid, {}).get(current) if current else None
                 if current_type in required:
                     continue
                 conflicts_found += 1
@@ -820,12 +924,7 @@ def solve_global_mapping(
                     continue
                 required = ("ORG_NAME",) if pos == 0 else ("DATE_PARTS",)
                 current = mapping_final.get(aid)
-                current_type = None
-                if current:
-                    for cand in candidates.get(aid, []):
-                        if cand.get("key") == current:
-                            current_type = cand.get("field_type")
-                            break
+                current_type = candidate_types.get(aid, {}).get(current) if current else None
                 if current_type in required:
                     continue
                 conflicts_found += 1
@@ -846,12 +945,7 @@ def solve_global_mapping(
                     continue
                 required = ("ORG_NAME",)
                 current = mapping_final.get(aid)
-                current_type = None
-                if current:
-                    for cand in candidates.get(aid, []):
-                        if cand.get("key") == current:
-                            current_type = cand.get("field_type")
-                            break
+                current_type = candidate_types.get(aid, {}).get(current) if current else None
                 if current_type in required:
                     continue
                 conflicts_found += 1
@@ -872,12 +966,7 @@ def solve_global_mapping(
                     continue
                 required = ("MONEY",) if pos == 0 else ("PERCENT",)
                 current = mapping_final.get(aid)
-                current_type = None
-                if current:
-                    for cand in candidates.get(aid, []):
-                        if cand.get("key") == current:
-                            current_type = cand.get("field_type")
-                            break
+                current_type = candidate_types.get(aid, {}).get(current) if current else None
                 if current_type in required:
                     continue
                 conflicts_found += 1
@@ -940,9 +1029,13 @@ def composite_map(
     model: HFModel,
     fuzzy_threshold: float = 0.6,
 ) -> Dict[str, object]:
-    base = _heuristic_mapping(anchors, data_norm, data_keys, llm_candidates=None, threshold=fuzzy_threshold)
+    # The heuristic pass and the candidate builder score the same queries.
+    text_scores = _anchor_text_scores(anchors, data_keys)
+    base = _heuristic_mapping(
+        anchors, data_norm, data_keys, llm_candidates=None, threshold=fuzzy_threshold, text_scores=text_scores
+    )
     llm_candidates = llm_suggest_candidates(anchors, data_keys, base, model)
-    candidates = _build_candidates(anchors, data_norm, data_keys, llm_candidates)
+    candidates = _build_candidates(anchors, data_norm, data_keys, llm_candidates, text_scores=text_scores)
     mapping_final, stats = solve_global_mapping(anchors, candidates)
     anchor_map = {str(a.get("anchor_id")): a for a in anchors if a.get("anchor_id")}
     final_map: Dict[str, Dict[str, Any]] = {}
@@ -968,22 +1061,26 @@ def llm_map_ambiguous(
     data_keys: List[str],
     model: HFModel,
     batch_size: int = 8,
+    scorer=None,
 ) -> Dict[str, List[Dict[str, Any]]]:
-    norm_keys = [_normalize_text(k) for k in data_keys]
-    key_tags = {k: _infer_tags_from_text(k) for k in data_keys}
+    keys = _prepare_keys(tuple(data_keys))
+    norm_keys, key_tags = keys.norm_keys, keys.key_tags
     ambiguous = []
-    for anchor_id, meta in heuristic_mapping.items():
-        if meta.get("ambiguous") is not True:
-            continue
-        label_text = str(meta.get("label_text") or "")
-        norm_label = _normalize_text(label_text)
+    pending = [
+        (anchor_id, str(meta.get("label_text") or ""))
+        for anchor_id, meta in heuristic_mapping.items()
+        if meta.get("ambiguous") is True
+    ]
+    norm_labels = [_normalize_text(label_text) for _, label_text in pending]
+    scores = _score_matrix(norm_labels, norm_keys, scorer or DEFAULT_LABEL_SCORER)
+    for row, (anchor_id, label_text), norm_label in zip(scores, pending, norm_labels):
         candidates: List[str] = []
         if norm_label:
-            matches = process.extract(norm_label, norm_keys, scorer=fuzz.WRatio, limit=8)
-            candidates = [data_keys[idx] for _, _, idx in matches]
+            candidates = [data_keys[idx] for idx, _ in _top_matches(row, 8)]
         label_tags = _infer_tags_from_text(label_text)
         if label_tags:
-            candidates = [k for k in candidates if set(label_tags) & set(key_tags.get(k, []))] or candidates
+            label_tag_set = set(label_tags)
+            candidates = [k for k in candidates if not label_tag_set.isdisjoint(key_tags[k])] or candidates
         ambiguous.append(
             {
                 "anchor_id": anchor_id,
@@ -998,24 +1095,10 @@ def llm_map_ambiguous(
         return {"items": items}
 
     if model and model.available():
-        for i in range(0, len(ambiguous), batch_size):
-            batch = ambiguous[i : i + batch_size]
-            prompt = (
-                "Return ONLY strict JSON with schema: "
-                '{"items":[{"anchor_id":"...","json_key":"...|null","confidence":0.0}]}.\n'
-                "Rules:\n"
-                "- Choose the single best JSON key from each anchor's candidates list.\n"
-                "- Prefer exact semantic match to the anchor label (Romanian).\n"
-                "- Respect expected_tags if present.\n"
-                "- If the label is a section title or not a field, use null.\n"
-                "- Confidence between 0.0 and 1.0.\n\n"
-                "Examples:\n"
-                "Label: 'Către' -> json_key: 'Catre - denumirea autoritatii contractante si adresa completa'\n"
-                "Label: 'reprezentanţi ai ofertantului' -> json_key: 'Denumirea / numele ofertantului'\n"
-                "Label: 'Data' -> json_key: 'Data'\n\n"
-                f"Anchors: {batch}\n"
-            )
-            response = model.generate(prompt)
+        batches = [ambiguous[i : i + batch_size] for i in range(0, len(ambiguous), batch_size)]
+        prompts = [f"{_CHOOSE_KEY_PROMPT}Anchors: {batch}\n" for batch in batches]
+
+        for batch, response in zip(batches, model.generate_batch(prompts)):
             parsed_items = _parse_llm_items(response)
             batch_ids = {b["anchor_id"] for b in batch}
             for item in parsed_items:
@@ -1045,11 +1128,12 @@ def llm_map_all(
     model: HFModel,
     batch_size: int = 8,
 ) -> Dict[str, List[Dict[str, Any]]]:
-    norm_keys = [_normalize_text(k) for k in data_keys]
-    key_tags = {k: _infer_tags_from_text(k) for k in data_keys}
+    keys = _prepare_keys(tuple(data_keys))
+    norm_keys, key_tags = keys.norm_keys, keys.key_tags
     items: List[Dict[str, Any]] = []
 
-    candidates_payload = []
+    pending: List[Tuple[str, str, str]] = []
+    queries: List[str] = []
     for anchor in anchors:
         anchor_id = str(anchor.get("anchor_id") or "")
         label_text = str(anchor.get("label_text") or "")
@@ -1060,12 +1144,17 @@ def llm_map_all(
         norm_nearby = _normalize_text(nearby_text)
         if not norm_label and not norm_nearby:
             continue
-        query = " ".join([t for t in (norm_label, norm_nearby) if t])
-        matches = process.extract(query, norm_keys, scorer=fuzz.token_set_ratio, limit=8)
-        candidates = [data_keys[idx] for _, _, idx in matches]
+        pending.append((anchor_id, label_text, nearby_text))
+        queries.append(" ".join([t for t in (norm_label, norm_nearby) if t]))
+
+    candidates_payload = []
+    scores = _score_matrix(queries, norm_keys, fuzz.token_set_ratio)
+    for row, (anchor_id, label_text, nearby_text) in zip(scores, pending):
+        candidates = [data_keys[idx] for idx, _ in _top_matches(row, 8)]
         label_tags = _infer_tags_from_text(label_text + " " + nearby_text)
         if label_tags:
-            candidates = [k for k in candidates if set(label_tags) & set(key_tags.get(k, []))] or candidates
+            label_tag_set = set(label_tags)
+            candidates = [k for k in candidates if not label_tag_set.isdisjoint(key_tags[k])] or candidates
         candidates_payload.append(
             {
                 "anchor_id": anchor_id,
@@ -1079,24 +1168,10 @@ def llm_map_all(
         return {"items": items}
 
     if model and model.available():
-        for i in range(0, len(candidates_payload), batch_size):
-            batch = candidates_payload[i : i + batch_size]
-            prompt = (
-                "Return ONLY strict JSON with schema: "
-                '{"items":[{"anchor_id":"...","json_key":"...|null","confidence":0.0}]}.\n'
-                "Rules:\n"
-                "- Choose the single best JSON key from each anchor's candidates list.\n"
-                "- Prefer exact semantic match to the anchor label (Romanian).\n"
-                "- Respect expected_tags if present.\n"
-                "- If the label is a section title or not a field, use null.\n"
-                "- Confidence between 0.0 and 1.0.\n\n"
-                "Examples:\n"
-                "Label: 'Către' -> json_key: 'Catre - denumirea autoritatii contractante si adresa completa'\n"
-                "Label: 'reprezentanţi ai ofertantului' -> json_key: 'Denumirea / numele ofertantului'\n"
-                "Label: 'Data' -> json_key: 'Data'\n\n"
-                f"Anchors: {batch}\n"
-            )
-            response = model.generate(prompt)
+        batches = [candidates_payload[i : i + batch_size] for i in range(0, len(candidates_payload), batch_size)]
+        prompts = [f"{_CHOOSE_KEY_PROMPT}Anchors: {batch}\n" for batch in batches]
+
+        for batch, response in zip(batches, model.generate_batch(prompts)):
             parsed_items = _parse_llm_items(response)
             batch_ids = {b["anchor_id"] for b in batch}
             for item in parsed_items:
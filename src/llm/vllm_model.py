@@ -0,0 +1,46 @@
+from typing import List, Optional
+
+from src.llm.hf_model import HFModel, _SYSTEM_MESSAGE
+
+
+class VLLMModel:
+    def __init__(
+        self,
+        model_name: str = "Qwen/Qwen2.5-3B-Instruct",
+        seed: Optional[int] = None,
+        dtype: str = "bfloat16",
+        gpu_memory_utilization: float = 0.85,
+        max_model_len: int = 4096,
+    ) -> None:
+        # vLLM is optional and GPU-only, so it is imported only when selected.
+        from vllm import LLM
+
+        self.model_name = model_name
+        self.seed = seed
+        engine_args = {"seed": seed} if seed is not None else {}
+        self.llm = LLM(
+            model=model_name,
+            dtype=dtype,
+            gpu_memory_utilization=gpu_memory_utilization,
+            max_model_len=max_model_len,
+            # Mapping prompts share the system turn and rule header; cached
+            # KV blocks let later batches skip prefilling them.
+            enable_prefix_caching=True,
+            **engine_args,
+        )
+
+    def generate(self, prompt: str, max_new_tokens: int = 512) -> str:
+        return self.generate_batch([prompt], max_new_tokens=max_new_tokens)[0]
+
+    def generate_batch(self, prompts: List[str], max_new_tokens: int = 512) -> List[str]:
+        if not prompts:
+            return []
+        from vllm import SamplingParams
+
+        sampling = SamplingParams(temperature=0.0, top_p=1.0, max_tokens=max_new_tokens, seed=self.seed)
+        conversations = [[_SYSTEM_MESSAGE, {"role": "user", "content": prompt}] for prompt in prompts]
+        outputs = self.llm.chat(conversations, sampling, use_tqdm=False)
+        return [HFModel._extract_json(output.outputs[0].text) for output in outputs]
+
+    def available(self) -> bool:
+        return self.llm is not None
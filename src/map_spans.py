@@ -1,12 +1,12 @@
 import json
 import random
 import re
-import unicodedata
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 from rapidfuzz import process, fuzz
 
+from src.data.normalize import strip_accents
 from src.llm.hf_model import HFModel
 from src.validate import (
     is_date,
@@ -23,8 +23,7 @@ from src.validate import (
 
 
 def _normalize_text(value: str) -> str:
-    text = value.lower()
-    text = "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+    text = strip_accents(value.lower())
     return " ".join(text.split())
 
 
@@ -223,7 +222,12 @@ def map_field_spans(
     used_keys: Dict[str, List[str]] = {}
     span_context_tokens: Dict[str, List[str]] = {}
     # First pass: collect candidates
-    sorted_spans = sorted(spans, key=lambda s: str(s.get("span_id") or ""))
+    # Document order, not span_id: ids are hashes, so ordering by them would let
+    # the hash function decide the greedy assignment. The sort is stable, so spans
+    # sharing a position (different cells) keep their extraction order.
+    sorted_spans = sorted(
+        spans, key=lambda s: (s.get("paragraph_idx") or 0, s.get("start_char") or 0, s.get("span_index") or 0)
+    )
 
     for span in sorted_spans:
         span_id = span.get("span_id")
@@ -245,20 +249,20 @@ def map_field_spans(
         candidates_by_span[span_id] = heuristic_candidates
 
     # Global assignment (greedy with reuse penalties)
-    span_order: List[Tuple[str, float]] = []
-    for span in sorted_spans:
+    span_order: List[Tuple[str, float, int]] = []
+    for position, span in enumerate(sorted_spans):
         span_id = span.get("span_id")
         if not span_id or span.get("blank_kind") == "checkbox":
             continue
         cand_list = candidates_by_span.get(span_id, [])
         top1 = cand_list[0]["score"] if len(cand_list) > 0 else 0.0
         top2 = cand_list[1]["score"] if len(cand_list) > 1 else 0.0
-        span_order.append((span_id, top1 - top2))
-    span_order.sort(key=lambda x: (-x[1], x[0]))
+        span_order.append((span_id, top1 - top2, position))
+    span_order.sort(key=lambda x: (-x[1], x[2]))
 
     span_map = {s.get("span_id"): s for s in sorted_spans}
 
-    for span_id, _gap in span_order:
+    for span_id, _gap, _position in span_order:
         span = span_map.get(span_id)
         if not span:
             continue
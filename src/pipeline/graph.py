@@ -15,7 +15,7 @@ from src.validate.mapping_rules import merge_mappings
 from src.report.make_report import write_report, write_text_report, build_report
 from src.extract_spans import extract_field_spans
 from src.map_spans import map_field_spans
-from src.fill_docx import fill_spans_in_docx
+from src.fill_docx import build_location_map, fill_spans_in_docx
 
 
 class State(TypedDict):
@@ -56,7 +56,7 @@ def _normalize_data_node(state: State, artifacts_dir: Path) -> State:
 
 def _extract_anchors_node(state: State, artifacts_dir: Path) -> State:
     doc = Document(str(state["template_path"]))
-    containers = list(iter_text_containers(doc))
+    containers = iter_text_containers(doc)
     anchors, clusters = extract_anchors(containers, doc)
     state["anchors"] = anchors
     state["anchor_clusters"] = clusters
@@ -75,8 +75,31 @@ def _extract_anchors_node(state: State, artifacts_dir: Path) -> State:
     return state
 
 
-def _map_spans_node(state: State, artifacts_dir: Path, model_name: str, seed: int, llm_enabled: bool) -> State:
-    model = HFModel(model_name=model_name, seed=seed) if llm_enabled else None
+def _load_model(
+    model_name: str,
+    llm_backend: str,
+    seed: Optional[int] = None,
+    compile_model: bool = False,
+    quantization: Optional[str] = None,
+):
+    if llm_backend == "vllm":
+        from src.llm.vllm_model import VLLMModel
+
+        return VLLMModel(model_name=model_name, seed=seed)
+    return HFModel(model_name=model_name, seed=seed, compile_model=compile_model, quantization=quantization)
+
+
+def _map_spans_node(
+    state: State,
+    artifacts_dir: Path,
+    model_name: str,
+    seed: int,
+    llm_enabled: bool,
+    llm_backend: str = "hf",
+    compile_model: bool = False,
+    quantization: Optional[str] = None,
+) -> State:
+    model = _load_model(model_name, llm_backend, seed, compile_model, quantization) if llm_enabled else None
     result = map_field_spans(
         state.get("field_spans", []),
         state.get("data_norm", {}),
@@ -96,9 +119,16 @@ def _heuristic_map_node(state: State, artifacts_dir: Path, threshold: int) -> St
     return state
 
 
-def _llm_map_ambiguous_node(state: State, artifacts_dir: Path, model_name: str) -> State:
+def _llm_map_ambiguous_node(
+    state: State,
+    artifacts_dir: Path,
+    model_name: str,
+    llm_backend: str = "hf",
+    compile_model: bool = False,
+    quantization: Optional[str] = None,
+) -> State:
     data_keys = list(state["data_norm"].keys())
-    model = HFModel(model_name=model_name)
+    model = _load_model(model_name, llm_backend, compile_model=compile_model, quantization=quantization)
     composite = composite_map(state.get("anchors", []), state["data_norm"], data_keys, model)
     state.update(
         {
@@ -166,20 +196,7 @@ def _fill_docx_node(state: State, artifacts_dir: Path, dry_run: bool) -> State:
 
     actions = state.get("actions", [])
 
-    def _loc_key(location: Dict[str, Any]) -> tuple:
-        return (
-            location.get("type"),
-            location.get("section_idx"),
-            location.get("header_footer"),
-            location.get("table_idx"),
-            location.get("row"),
-            location.get("col"),
-            location.get("paragraph_idx"),
-        )
-
-    location_map = {}
-    for container in iter_text_containers(doc):
-        location_map[_loc_key(container.location.__dict__)] = container
+    location_map = build_location_map(doc)
 
     checkbox_anchors = [
         a
@@ -196,6 +213,7 @@ def _fill_docx_node(state: State, artifacts_dir: Path, dry_run: bool) -> State:
         state.get("data_norm", {}),
         state.get("span_mapping", {}).get("computed_values", {}),
         state.get("span_mapping", {}).get("expected_types", {}),
+        location_map=location_map,
     )
 
     label_mapping = {
@@ -333,6 +351,9 @@ def run_pipeline(
     strict: bool = False,
     seed: int = 42,
     llm_enabled: bool = True,
+    llm_backend: str = "hf",
+    compile_model: bool = False,
+    quantization: Optional[str] = None,
     heuristic_threshold: int = 90,
     llm_threshold: float = 0.15,
     prioritize_llm: bool = True,
@@ -365,8 +386,16 @@ def run_pipeline(
     graph.add_node("normalize_data_node", lambda s: _normalize_data_node(s, artifacts_dir))
     graph.add_node("extract_anchors_node", lambda s: _extract_anchors_node(s, artifacts_dir))
     graph.add_node("heuristic_map_node", lambda s: _heuristic_map_node(s, artifacts_dir, heuristic_threshold))
-    graph.add_node("llm_map_ambiguous_node", lambda s: _llm_map_ambiguous_node(s, artifacts_dir, model_name))
-    graph.add_node("map_spans_node", lambda s: _map_spans_node(s, artifacts_dir, model_name, seed, llm_enabled))
+    graph.add_node(
+        "llm_map_ambiguous_node",
+        lambda s: _llm_map_ambiguous_node(s, artifacts_dir, model_name, llm_backend, compile_model, quantization),
+    )
+    graph.add_node(
+        "map_spans_node",
+        lambda s: _map_spans_node(
+            s, artifacts_dir, model_name, seed, llm_enabled, llm_backend, compile_model, quantization
+        ),
+    )
     graph.add_node(
         "validate_merge_node",
         lambda s: _validate_merge_node(
@@ -397,7 +426,7 @@ def run_pipeline(
         if not result.get("issues"):
             break
         _heuristic_map_node(result, artifacts_dir, threshold=repair_heuristic_threshold)
-        _llm_map_ambiguous_node(result, artifacts_dir, model_name)
+        _llm_map_ambiguous_node(result, artifacts_dir, model_name, llm_backend, compile_model, quantization)
         _validate_merge_node(
             result,
             artifacts_dir,
@@ -1,13 +1,13 @@
 import re
-import unicodedata
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict
 
+from src.data.normalize import strip_accents
+
 
 def _normalize_text(value: str) -> str:
-	text = value.lower()
-	text = "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+	text = strip_accents(value.lower())
 	return " ".join(text.split())
 
 